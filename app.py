@@ -3,7 +3,6 @@ from typing import Optional
 from src.modelos.models import Book, User, Editorial, Genero
 from src.servicios.library_service import LibraryService
 from src.servicios.search_service import SearchService
-from src.persistencia.persistencia import cargar_desde_json
 
 def input_int(prompt: str) -> int:
     while True:
@@ -153,13 +152,12 @@ def ejecutar_busquedas():
     # Crear instancia del servicio de búsqueda
     search_svc = SearchService()
     
-    # Cargar datos desde archivos JSON
-    editoriales = cargar_desde_json("data/editoriales.json", Editorial)
-    generos = cargar_desde_json("data/generos.json", Genero)
-    
-    # Cargar datos en los árboles
-    search_svc.cargar_editoriales(editoriales)
-    search_svc.cargar_generos(generos)
+    # Cargar datos desde archivos JSON en los árboles
+    try:
+        search_svc.cargar_desde_disco()
+    except ValueError as error:
+        print(f"No se pudieron cargar los datos: {error}")
+        return
     
     while True:
         print("\n--- Búsquedas y Gestión (Árboles) ---")
@@ -171,6 +169,7 @@ def ejecutar_busquedas():
         print("6. Insertar género")
         print("7. Actualizar editorial")
         print("8. Actualizar género")
+        print("9. Autocompletar editoriales y géneros")
         print("0. Volver al menú principal")
         op = input("Opción: ").strip()
         
@@ -297,6 +296,13 @@ def ejecutar_busquedas():
                 print("Género actualizado correctamente.")
             else:
                 print("Error al actualizar el género.")
+        
+        elif op == "9":
+            prefijo = input("Prefijo: ").strip()
+            for e in search_svc.sugerir_editoriales(prefijo):
+                print(f"Editorial: {e.id} | {e.nombre}")
+            for g in search_svc.sugerir_generos(prefijo):
+                print(f"Género: {g.id} | {g.nombre}")
                     
         elif op == "0":
             return
@@ -304,15 +310,22 @@ def ejecutar_busquedas():
         else:
             print("Opción inválida.")
 
+RUTA_ESTADO = "data/biblioteca.json"
+RUTA_HISTORIAL = "data/historial.jsonl"
+
 def main():
-    svc = LibraryService()
+    svc = LibraryService(ruta_historial=RUTA_HISTORIAL)
+    try:
+        svc.cargar_estado(RUTA_ESTADO)
+    except ValueError as error:
+        print(f"No se pudo restaurar el estado: {error}")
     while True:
         print("\n===== Sistema de Gestión de Biblioteca (Lineal) =====")
         print("1. Gestión de Libros")
         print("2. Gestión de Usuarios")
         print("3. Préstamos/Reservas")
         print("4. Editoriales y Géneros (Árboles)")
-        print("9. Ver última acción (pila historial)")
+        print("9. Ver última acción (historial)")
         print("0. Salir")
         op = input("Opción: ").strip()
         if op == "1":
@@ -327,6 +340,7 @@ def main():
             top = svc.ver_top_historial()
             print(f"Última acción: {top}" if top else "Historial vacío.")
         elif op == "0":
+            svc.guardar_estado(RUTA_ESTADO)
             print("¡Hasta luego!")
             break
         else:
@@ -0,0 +1 @@
+# Archivo de inicialización para el paquete benchmarks
@@ -0,0 +1,49 @@
+"""
+Benchmark: carga de claves ordenadas en ArbolBinarioBusqueda simple vs. AVL.
+
+Reproduce el caso de SearchService.cargar_editoriales, donde el JSON llega ya
+ordenado por nombre. Uso:
+
+    python -m benchmarks.bench_arboles [n_avl] [n_simple]
+
+El ABB simple degenera en una lista (O(n) por operación, O(n^2) la carga), por
+lo que se mide con un n menor.
+"""
+from __future__ import annotations
+import sys
+import time
+from typing import Optional
+
+from src.estructuras.arboles import ArbolBinarioBusqueda
+
+
+def medir(n: int, balanceo: Optional[str]) -> None:
+    claves = [f"editorial {i:07d}" for i in range(n)]
+    arbol = ArbolBinarioBusqueda[str, int](balanceo=balanceo)
+    nombre = balanceo or "simple"
+    inicio = time.perf_counter()
+    for i, clave in enumerate(claves):
+        arbol.insertar(clave, i)
+    t_carga = time.perf_counter() - inicio
+
+    muestras = claves[:: max(1, n // 10_000)]
+    inicio = time.perf_counter()
+    for clave in muestras:
+        arbol.buscar(clave)
+    t_busqueda = (time.perf_counter() - inicio) / len(muestras)
+
+    print(f"{nombre:>7} | n={n:>9,} | altura={arbol.altura():>7,} | "
+          f"carga={t_carga:8.2f}s ({t_carga / n * 1e6:7.2f} us/ins) | "
+          f"buscar={t_busqueda * 1e6:9.2f} us")
+
+
+def main() -> None:
+    n_avl = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_simple = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    medir(n_simple, None)
+    medir(n_simple, "avl")
+    medir(n_avl, "avl")
+
+
+if __name__ == "__main__":
+    main()
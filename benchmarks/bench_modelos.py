@@ -0,0 +1,73 @@
+"""
+Benchmark de memoria: préstamos como dataclass con __dict__ (versión anterior),
+como dataclass con __slots__ (Loan actual) y en columnas (LoanTable).
+
+Construye n préstamos como lo hace prestar_libro (ids y fechas creados en cada
+alta) y reporta la memoria retenida, escalada a un millón de préstamos. Uso:
+
+    python -m benchmarks.bench_modelos [n]
+"""
+from __future__ import annotations
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional
+
+from src.estructuras.tabla_prestamos import LoanTable
+from src.modelos.models import Loan
+
+
+@dataclass
+class LoanConDict:
+    """Loan anterior: dataclass sin __slots__ (un __dict__ por instancia)."""
+    loan_id: str
+    user_id: str
+    isbn: str
+    fecha_prestamo: date
+    fecha_devolucion_estimada: date
+    fecha_devolucion_real: Optional[date] = None
+    devuelto: bool = False
+
+
+def en_dict(clase) -> Callable[[int], object]:
+    def construir(n: int) -> Dict[str, object]:
+        prestamos = {}
+        base = date(2025, 1, 1)
+        for i in range(n):
+            loan_id = f"L{i:07d}"
+            inicio = base + timedelta(days=i % 300)
+            prestamos[loan_id] = clase(loan_id, f"U{i % 5000}", f"978-{i % 20000:09d}",
+                                       inicio, inicio + timedelta(days=7))
+        return prestamos
+    return construir
+
+
+def en_tabla(n: int) -> LoanTable:
+    tabla = LoanTable()
+    base = date(2025, 1, 1)
+    for i in range(n):
+        inicio = base + timedelta(days=i % 300)
+        tabla.agregar(Loan(f"L{i:07d}", f"U{i % 5000}", f"978-{i % 20000:09d}", inicio, inicio + timedelta(days=7)))
+    return tabla
+
+
+def memoria(nombre: str, construir: Callable[[int], object], n: int) -> None:
+    tracemalloc.start()
+    estructura = construir(n)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del estructura
+    por_millon = actual / n * 1_000_000 / 2**20
+    print(f"{nombre:>18} | n={n:>9,} | {actual / 2**20:9.1f} MiB | {por_millon:8.1f} MiB por millón")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    memoria("dataclass __dict__", en_dict(LoanConDict), n)
+    memoria("dataclass slots", en_dict(Loan), n)
+    memoria("LoanTable", en_tabla, n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: instantáneas JSON (guardar_a_json / cargar_desde_json) frente al
+formato binario columnar (guardar_instantanea / cargar_instantanea).
+
+Mide tiempo de guardado, tiempo de carga y tamaño en disco para Book y Loan.
+Uso:
+
+    python -m benchmarks.bench_persistencia [n]
+"""
+from __future__ import annotations
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks import datos
+from src.modelos.models import Book, Loan
+from src.persistencia.persistencia import cargar_instantanea, guardar_instantanea
+
+
+def generar(n: int):
+    libros = datos.libros(n)
+    return {Book: libros, Loan: datos.prestamos(n, [b.isbn for b in libros])}
+
+
+def medir(clase, objetos, formato: str, directorio: str) -> None:
+    ruta = os.path.join(directorio, f"{clase.__name__}.{formato}")
+    inicio = time.perf_counter()
+    guardar_instantanea(objetos, ruta, clase, formato=formato)
+    t_guardar = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    cargados = cargar_instantanea(ruta, clase)
+    t_cargar = time.perf_counter() - inicio
+    assert cargados == objetos
+    print(f"{clase.__name__:>5} | {formato:>7} | guardar={t_guardar:7.3f}s | cargar={t_cargar:7.3f}s | "
+          f"tamaño={os.path.getsize(ruta) / 2**20:8.2f} MiB")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directorio:
+        for clase, objetos in generar(n).items():
+            for formato in ("json", "binario"):
+                medir(clase, objetos, formato, directorio)
+
+
+if __name__ == "__main__":
+    main()
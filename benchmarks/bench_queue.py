@@ -0,0 +1,64 @@
+"""
+Microbenchmark: Queue (deque) frente a la versión anterior basada en list.pop(0).
+
+Simula la cola de reservas de un título popular: se encolan n user_id y se
+atienden todos. Uso:
+
+    python -m benchmarks.bench_queue [n]
+"""
+from __future__ import annotations
+import sys
+import time
+import tracemalloc
+from typing import Callable, Generic, List, TypeVar
+
+from src.estructuras.ds_linear import Queue
+
+T = TypeVar("T")
+
+
+class ListQueue(Generic[T]):
+    """Implementación anterior: dequeue con list.pop(0), O(n) por operación."""
+    def __init__(self) -> None:
+        self._data: List[T] = []
+
+    def enqueue(self, value: T) -> None:
+        self._data.append(value)
+
+    def dequeue(self) -> T:
+        return self._data.pop(0)
+
+
+def medir(nombre: str, crear: Callable[[], object], ids: List[str]) -> None:
+    cola = crear()
+    inicio = time.perf_counter()
+    for uid in ids:
+        cola.enqueue(uid)
+    for _ in ids:
+        cola.dequeue()
+    total = time.perf_counter() - inicio
+    print(f"{nombre:>14} | n={len(ids):>9,} | {total:8.3f}s ({total / len(ids) * 1e9:8.1f} ns/par)")
+
+
+def memoria(nombre: str, crear: Callable[[], Queue], n: int) -> None:
+    # user_id construidos en tiempo de ejecución (como los que llegan del CLI)
+    tracemalloc.start()
+    cola = crear()
+    for i in range(n):
+        cola.enqueue("".join(("U", str(i % 1000))))
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:>14} | n={n:>9,} | {actual / 1024:10.1f} KiB retenidos")
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ids = [f"U{i}" for i in range(n)]
+    medir("list.pop(0)", ListQueue, ids)
+    medir("deque", Queue, ids)
+    memoria("deque", Queue, n)
+    memoria("deque compact", lambda: Queue(compact=True), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Generador de datos sintéticos para los benchmarks. Con la misma semilla
+produce siempre los mismos datos, así dos corridas son comparables.
+"""
+from __future__ import annotations
+import random
+from datetime import date, timedelta
+from typing import List, Sequence
+
+from src.modelos.models import Book, Editorial, Loan, User
+
+AUTORES = ["García Márquez", "Borges", "Cortázar", "Allende", "Neruda", "Mistral", "Paz", "Rulfo"]
+PAISES = ["Argentina", "Chile", "Colombia", "España", "México", "Perú", "Uruguay"]
+
+
+def isbn(i: int) -> str:
+    return f"978-{i:09d}"
+
+
+def libros(n: int, semilla: int = 42, ejemplares: int = 3) -> List[Book]:
+    """n libros con ISBN únicos, en orden aleatorio."""
+    rnd = random.Random(semilla)
+    resultado = [Book(isbn(i), f"Título {i}", rnd.choice(AUTORES), rnd.randint(1900, 2025), ejemplares, ejemplares)
+                 for i in range(n)]
+    rnd.shuffle(resultado)
+    return resultado
+
+
+def usuarios(n: int) -> List[User]:
+    return [User(f"U{i:07d}", f"Usuario {i}", f"u{i}@example.com") for i in range(n)]
+
+
+def prestamos(n: int, isbns: Sequence[str], semilla: int = 42) -> List[Loan]:
+    """n préstamos de libros tomados de isbns, con fechas repartidas en 300 días."""
+    rnd = random.Random(semilla)
+    base = date(2025, 1, 1)
+    return [Loan(f"L{i:07d}", f"U{rnd.randrange(n // 10 + 1):07d}", rnd.choice(isbns),
+                 base + timedelta(days=i % 300), base + timedelta(days=i % 300 + 7))
+            for i in range(n)]
+
+
+def editoriales(n: int, semilla: int = 42) -> List[Editorial]:
+    rnd = random.Random(semilla)
+    return [Editorial(f"ED{i}", f"Editorial {i:07d}", rnd.choice(PAISES), rnd.randint(1800, 2020)) for i in range(n)]
+
+
+def claves(n: int, ordenadas: bool, semilla: int = 42) -> List[str]:
+    resultado = [f"clave {i:09d}" for i in range(n)]
+    if not ordenadas:
+        random.Random(semilla).shuffle(resultado)
+    return resultado
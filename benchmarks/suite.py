@@ -0,0 +1,314 @@
+"""
+Suite de benchmarks de estructuras, servicios y persistencia, solo con la
+biblioteca estándar. Cada caso se prepara fuera de la medición, se repite con
+datos nuevos y se reporta el mejor tiempo. Los resultados se escriben en JSON
+para comparar corridas:
+
+    python -m benchmarks.suite --tamanos 10000 100000 --salida base.json
+    python -m benchmarks.suite --tamanos 10000 100000 --comparar base.json
+
+Casos disponibles: python -m benchmarks.suite --listar
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks import datos
+from src.estructuras.arboles import ArbolBinarioBusqueda
+from src.estructuras.ds_linear import ArrayList, Queue, SinglyLinkedList
+from src.modelos.models import Book, Editorial, User
+from src.persistencia.persistencia import cargar_desde_json, guardar_a_json
+from src.servicios.library_service import LibraryService
+
+# preparar() -> contexto (no se mide); medir(contexto) se mide; operaciones por medición;
+# tamaño efectivo de los datos (puede ser menor que el pedido, ver N_DEGENERADO)
+Caso = Tuple[Callable[[], Any], Callable[[Any], None], int, int]
+
+CASOS: Dict[str, Callable[[int], Caso]] = {}
+
+
+def caso(nombre: str) -> Callable[[Callable[[int], Caso]], Callable[[int], Caso]]:
+    def registrar(funcion: Callable[[int], Caso]) -> Callable[[int], Caso]:
+        CASOS[nombre] = funcion
+        return funcion
+    return registrar
+
+
+@dataclass
+class Resultado:
+    caso: str
+    n: int  # tamaño efectivo con el que corrió el caso
+    n_pedido: int  # tamaño pedido con --tamanos (clave para comparar corridas)
+    operaciones: int
+    tiempos: List[float] = field(default_factory=list)
+
+    @property
+    def mejor(self) -> float:
+        return min(self.tiempos)
+
+    @property
+    def ns_por_op(self) -> float:
+        return self.mejor / self.operaciones * 1e9
+
+    def a_dict(self) -> Dict[str, Any]:
+        datos_resultado = asdict(self)
+        datos_resultado.update(mejor=self.mejor, ns_por_op=self.ns_por_op)
+        return datos_resultado
+
+
+# ---------------------- Estructuras lineales ----------------------
+@caso("arraylist.binary_search_index")
+def _busqueda_binaria(n: int) -> Caso:
+    rnd = random.Random(1)
+    consultas = [datos.isbn(rnd.randrange(2 * n)) for _ in range(10_000)]  # ~50 % aciertos
+    def preparar() -> ArrayList[Book]:
+        arreglo = ArrayList[Book](key_fn=lambda b: b.isbn)
+        arreglo.extend_sorted(datos.libros(n))
+        return arreglo
+    def medir(arreglo: ArrayList[Book]) -> None:
+        for isbn in consultas:
+            arreglo.binary_search_index(isbn)
+    return preparar, medir, len(consultas), n
+
+
+@caso("singly_linked_list.find_first")
+def _busqueda_lineal(n: int) -> Caso:
+    rnd = random.Random(2)
+    # O(n) por consulta: la cantidad de consultas baja con n para acotar la duración
+    consultas = [f"U{rnd.randrange(n):07d}" for _ in range(max(10, 1_000_000 // n))]
+    def preparar() -> SinglyLinkedList[User]:
+        lista = SinglyLinkedList[User]()
+        for usuario in datos.usuarios(n):
+            lista.push_front(usuario)
+        return lista
+    def medir(lista: SinglyLinkedList[User]) -> None:
+        for user_id in consultas:
+            lista.find_first(lambda u: u.user_id == user_id)
+    return preparar, medir, len(consultas), n
+
+
+@caso("queue.dequeue")
+def _desencolar(n: int) -> Caso:
+    def preparar() -> Queue[str]:
+        cola = Queue[str](compact=True)
+        cola.enqueue_many(f"U{i % 1000}" for i in range(n))
+        return cola
+    def medir(cola: Queue[str]) -> None:
+        for _ in range(n):
+            cola.dequeue()
+    return preparar, medir, n, n
+
+
+# ---------------------- Árboles ----------------------
+def _insertar_en_arbol(n: int, ordenadas: bool, balanceo: Optional[str]) -> Caso:
+    claves = datos.claves(n, ordenadas)
+    def preparar() -> ArbolBinarioBusqueda[str, int]:
+        return ArbolBinarioBusqueda[str, int](balanceo=balanceo)
+    def medir(arbol: ArbolBinarioBusqueda[str, int]) -> None:
+        for i, clave in enumerate(claves):
+            arbol.insertar(clave, i)
+    return preparar, medir, n, n
+
+
+@caso("abb_avl.insertar_ordenadas")
+def _avl_ordenadas(n: int) -> Caso:
+    return _insertar_en_arbol(n, True, "avl")
+
+
+@caso("abb_avl.insertar_aleatorias")
+def _avl_aleatorias(n: int) -> Caso:
+    return _insertar_en_arbol(n, False, "avl")
+
+
+# Con claves ordenadas el ABB simple degenera en una lista (inserción O(n) por
+# clave): esos casos usan como máximo N_DEGENERADO claves para terminar pronto
+N_DEGENERADO = 2_000
+
+
+@caso("abb_simple.insertar_ordenadas")
+def _simple_ordenadas(n: int) -> Caso:
+    return _insertar_en_arbol(min(n, N_DEGENERADO), True, None)
+
+
+@caso("abb_simple.insertar_aleatorias")
+def _simple_aleatorias(n: int) -> Caso:
+    return _insertar_en_arbol(n, False, None)
+
+
+def _buscar_en_arbol(n: int, ordenadas: bool, balanceo: Optional[str]) -> Caso:
+    claves = datos.claves(n, ordenadas)
+    consultas = random.Random(3).sample(claves, min(n, 10_000))
+    def preparar() -> ArbolBinarioBusqueda[str, int]:
+        arbol = ArbolBinarioBusqueda[str, int](balanceo=balanceo)
+        for i, clave in enumerate(claves):
+            arbol.insertar(clave, i)
+        return arbol
+    def medir(arbol: ArbolBinarioBusqueda[str, int]) -> None:
+        for clave in consultas:
+            arbol.buscar(clave)
+    return preparar, medir, len(consultas), n
+
+
+@caso("abb_avl.buscar_ordenadas")
+def _avl_buscar_ordenadas(n: int) -> Caso:
+    return _buscar_en_arbol(n, True, "avl")
+
+
+@caso("abb_avl.buscar_aleatorias")
+def _avl_buscar_aleatorias(n: int) -> Caso:
+    return _buscar_en_arbol(n, False, "avl")
+
+
+@caso("abb_simple.buscar_ordenadas")
+def _simple_buscar_ordenadas(n: int) -> Caso:
+    return _buscar_en_arbol(min(n, N_DEGENERADO), True, None)
+
+
+@caso("abb_simple.buscar_aleatorias")
+def _simple_buscar_aleatorias(n: int) -> Caso:
+    return _buscar_en_arbol(n, False, None)
+
+
+# ---------------------- Servicios ----------------------
+def _biblioteca(n: int) -> Tuple[LibraryService, List[str], List[str]]:
+    svc = LibraryService()
+    libros = datos.libros(n)
+    svc.agregar_libros(libros)
+    usuarios = datos.usuarios(max(1, n // 10))
+    for usuario in usuarios:
+        svc.registrar_usuario(usuario)
+    return svc, [b.isbn for b in libros], [u.user_id for u in usuarios]
+
+
+@caso("library_service.prestar_libro")
+def _prestar(n: int) -> Caso:
+    m = min(n, 10_000)
+    def preparar() -> Tuple[LibraryService, List[Tuple[str, str]]]:
+        svc, isbns, user_ids = _biblioteca(n)
+        rnd = random.Random(4)
+        return svc, [(rnd.choice(isbns), rnd.choice(user_ids)) for _ in range(m)]
+    def medir(contexto: Tuple[LibraryService, List[Tuple[str, str]]]) -> None:
+        svc, pedidos = contexto
+        for isbn, user_id in pedidos:
+            svc.prestar_libro(isbn, user_id)
+    return preparar, medir, m, n
+
+
+@caso("library_service.devolver_libro")
+def _devolver(n: int) -> Caso:
+    m = min(n, 10_000)
+    def preparar() -> Tuple[LibraryService, List[str]]:
+        svc, isbns, user_ids = _biblioteca(n)
+        rnd = random.Random(5)
+        # ISBN distintos: todos los préstamos se conceden y hay exactamente m devoluciones
+        return svc, [svc.prestar_libro(isbn, rnd.choice(user_ids)) for isbn in rnd.sample(isbns, m)]
+    def medir(contexto: Tuple[LibraryService, List[str]]) -> None:
+        svc, loan_ids = contexto
+        for loan_id in loan_ids:
+            svc.devolver_libro(loan_id)
+    return preparar, medir, m, n
+
+
+# ---------------------- Persistencia ----------------------
+@caso("persistencia.guardar_a_json")
+def _guardar_json(n: int) -> Caso:
+    editoriales = datos.editoriales(n)
+    directorio = tempfile.TemporaryDirectory(prefix="bench_")  # se borra al liberar el caso
+    ruta = os.path.join(directorio.name, "editoriales.json")
+    def medir(_: Any) -> None:
+        guardar_a_json(editoriales, ruta)
+    return (lambda: directorio), medir, n, n
+
+
+@caso("persistencia.cargar_desde_json")
+def _cargar_json(n: int) -> Caso:
+    directorio = tempfile.TemporaryDirectory(prefix="bench_")
+    ruta = os.path.join(directorio.name, "editoriales.json")
+    guardar_a_json(datos.editoriales(n), ruta)
+    def medir(_: Any) -> None:
+        cargar_desde_json(ruta, Editorial)
+    return (lambda: directorio), medir, n, n
+
+
+# ---------------------- Ejecución ----------------------
+def ejecutar(nombre: str, n: int, repeticiones: int) -> Resultado:
+    preparar, medir, operaciones, n_efectivo = CASOS[nombre](n)
+    resultado = Resultado(nombre, n_efectivo, n, operaciones)
+    for _ in range(repeticiones):
+        contexto = preparar()
+        inicio = time.perf_counter()
+        medir(contexto)
+        resultado.tiempos.append(time.perf_counter() - inicio)
+    return resultado
+
+
+def comparar(resultados: List[Resultado], ruta_base: str, tolerancia: float) -> int:
+    """Imprime la relación con una corrida anterior; devuelve cuántos casos empeoraron más que tolerancia."""
+    with open(ruta_base, 'r', encoding='utf-8') as archivo:
+        base = {(r["caso"], r.get("n_pedido", r["n"])): r for r in json.load(archivo)["resultados"]}
+    regresiones = 0
+    for resultado in resultados:
+        anterior = base.get((resultado.caso, resultado.n_pedido))
+        if anterior is None:
+            continue
+        relacion = resultado.ns_por_op / anterior["ns_por_op"]
+        marca = ""
+        if relacion > 1 + tolerancia:
+            marca = "  <-- más lento"
+            regresiones += 1
+        print(f"{resultado.caso:<34} n={resultado.n:>9,} {relacion:6.2f}x{marca}")
+    return regresiones
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de estructuras, servicios y persistencia")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), default=None,
+                        help="subconjunto de casos (por defecto, todos)")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="resultados JSON de una corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="empeoramiento relativo tolerado al comparar (0.10 = 10 %%)")
+    parser.add_argument("--listar", action="store_true", help="mostrar los casos disponibles y salir")
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        print("\n".join(sorted(CASOS)))
+        return 0
+
+    resultados = []
+    for n in args.tamanos:
+        for nombre in args.casos or list(CASOS):
+            resultado = ejecutar(nombre, n, args.repeticiones)
+            resultados.append(resultado)
+            print(f"{nombre:<34} n={resultado.n:>9,} | {resultado.mejor:8.4f}s | {resultado.ns_por_op:12.1f} ns/op")
+
+    if args.salida:
+        informe = {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementacion": platform.python_implementation(),
+            "plataforma": platform.platform(),
+            "repeticiones": args.repeticiones,
+            "resultados": [r.a_dict() for r in resultados],
+        }
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        return 1 if comparar(resultados, args.comparar, args.tolerancia) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
 from __future__ import annotations
-from typing import Any, Callable, Generic, Optional, TypeVar, List
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Optional, Tuple, TypeVar, List
 
 T = TypeVar("T")
 K = TypeVar("K")
 
+# Modos de balanceo admitidos: None (ABB simple) o "avl" (autobalanceado).
+BALANCEOS = (None, "avl")
+
 class NodoArbol(Generic[K, T]):
     """Nodo para el Árbol Binario de Búsqueda."""
     def __init__(self, clave: K, valor: T):
@@ -11,61 +14,373 @@ class NodoArbol(Generic[K, T]):
         self.valor: T = valor
         self.izquierdo: Optional[NodoArbol[K, T]] = None
         self.derecho: Optional[NodoArbol[K, T]] = None
+        self.altura: int = 1  # solo se mantiene en modo AVL
+        self.tamano: int = 1  # nodos del subárbol (estadísticos de orden)
+
+def _altura(nodo: Optional[NodoArbol[K, T]]) -> int:
+    return nodo.altura if nodo else 0
+
+def _tamano(nodo: Optional[NodoArbol[K, T]]) -> int:
+    return nodo.tamano if nodo else 0
 
 class ArbolBinarioBusqueda(Generic[K, T]):
     """
     Árbol Binario de Búsqueda genérico.
-    - Permite insertar datos con una clave y un valor.
+    - Permite insertar y eliminar datos con una clave y un valor.
     - Buscar un nodo por clave.
-    - Recorrer el árbol en orden (inorden).
+    - Recorrer el árbol en orden (inorden), completo o de forma perezosa.
+    - Consultas ordenadas: rango, floor/ceiling, min/max y estadísticos de
+      orden (k_esimo, rank) apoyados en el tamaño de cada subárbol.
+    - Todas las operaciones son iterativas: un árbol degenerado no agota la pila de Python.
+    - Con balanceo="avl" se mantiene balanceado (altura O(log n)) sin importar
+      el orden de inserción, p. ej. al cargar claves ya ordenadas.
     """
-    def __init__(self, key_fn: Optional[Callable[[T], K]] = None):
+    def __init__(self, key_fn: Optional[Callable[[T], K]] = None, balanceo: Optional[str] = None):
+        if balanceo not in BALANCEOS:
+            raise ValueError(f"balanceo no soportado: {balanceo!r}")
         self.raiz: Optional[NodoArbol[K, T]] = None
         self.key_fn = key_fn  # Función opcional para extraer la clave del valor
+        self.balanceo = balanceo
+
+    @classmethod
+    def desde_ordenados(cls, pares: Iterable[Tuple[K, T]], key_fn: Optional[Callable[[T], K]] = None,
+                        balanceo: Optional[str] = None) -> ArbolBinarioBusqueda[K, T]:
+        """Construye un árbol perfectamente balanceado a partir de pares (clave, valor).
+        Si los pares ya vienen ordenados por clave el costo es O(n); si no, se
+        ordenan primero (O(n log n)). El resultado también es un AVL válido.
+        """
+        arbol = cls(key_fn=key_fn, balanceo=balanceo)
+        pares = list(pares)
+        if any(pares[i + 1][0] < pares[i][0] for i in range(len(pares) - 1)):
+            pares.sort(key=lambda par: par[0])
+        arbol.raiz = arbol._construir_balanceado(pares, 0, len(pares))
+        return arbol
+
+    def _construir_balanceado(self, pares: List[Tuple[K, T]], inicio: int, fin: int) -> Optional[NodoArbol[K, T]]:
+        """Toma el elemento central como raíz; la recursión solo llega a profundidad log2(n)."""
+        if inicio >= fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = NodoArbol(*pares[medio])
+        nodo.izquierdo = self._construir_balanceado(pares, inicio, medio)
+        nodo.derecho = self._construir_balanceado(pares, medio + 1, fin)
+        self._actualizar(nodo)
+        return nodo
 
     def insertar(self, clave: K, valor: T) -> None:
-        """Inserta un nuevo nodo con la clave y valor dados."""
+        """Inserta un nuevo nodo con la clave y valor dados (iterativo, sin recursión)."""
+        nuevo = NodoArbol(clave, valor)
         if self.raiz is None:
-            self.raiz = NodoArbol(clave, valor)
+            self.raiz = nuevo
+            return
+        camino: List[NodoArbol[K, T]] = []
+        nodo = self.raiz
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = nodo.izquierdo if clave < nodo.clave else nodo.derecho
+        padre = camino[-1]
+        if clave < padre.clave:
+            padre.izquierdo = nuevo
+        else:  # clave >= padre.clave, permitimos duplicados a la derecha
+            padre.derecho = nuevo
+        if self.balanceo == "avl":
+            self._rebalancear_camino(camino)
         else:
-            self._insertar_recursivo(self.raiz, clave, valor)
+            for ancestro in camino:
+                ancestro.tamano += 1
 
-    def _insertar_recursivo(self, nodo: NodoArbol[K, T], clave: K, valor: T) -> None:
-        """Método auxiliar recursivo para insertar un nodo."""
-        if clave < nodo.clave:
-            if nodo.izquierdo is None:
-                nodo.izquierdo = NodoArbol(clave, valor)
-            else:
-                self._insertar_recursivo(nodo.izquierdo, clave, valor)
-        else:  # clave >= nodo.clave, permitimos duplicados a la derecha
-            if nodo.derecho is None:
-                nodo.derecho = NodoArbol(clave, valor)
+    def eliminar(self, clave: K) -> Optional[T]:
+        """Elimina un nodo con la clave dada y devuelve su valor (None si no existe).
+        Un nodo con dos hijos se reemplaza por su sucesor inorden; en modo AVL se
+        rebalancean los ancestros, por lo que el costo es O(log n).
+        """
+        camino: List[NodoArbol[K, T]] = []
+        nodo = self.raiz
+        while nodo is not None and clave != nodo.clave:
+            camino.append(nodo)
+            nodo = nodo.izquierdo if clave < nodo.clave else nodo.derecho
+        if nodo is None:
+            return None
+        valor = nodo.valor
+        if nodo.izquierdo is not None and nodo.derecho is not None:
+            camino.append(nodo)
+            sucesor = nodo.derecho
+            while sucesor.izquierdo is not None:
+                camino.append(sucesor)
+                sucesor = sucesor.izquierdo
+            nodo.clave, nodo.valor = sucesor.clave, sucesor.valor
+            nodo = sucesor  # el sucesor tiene a lo sumo un hijo (derecho)
+        hijo = nodo.izquierdo if nodo.izquierdo is not None else nodo.derecho
+        if not camino:
+            self.raiz = hijo
+        elif camino[-1].izquierdo is nodo:
+            camino[-1].izquierdo = hijo
+        else:
+            camino[-1].derecho = hijo
+        if self.balanceo == "avl":
+            self._rebalancear_camino(camino)
+        else:
+            for ancestro in camino:
+                ancestro.tamano -= 1
+        return valor
+
+    def __len__(self) -> int:
+        return _tamano(self.raiz)
+
+    # ---------------------- Balanceo AVL ----------------------
+    @staticmethod
+    def _actualizar(nodo: NodoArbol[K, T]) -> None:
+        nodo.altura = 1 + max(_altura(nodo.izquierdo), _altura(nodo.derecho))
+        nodo.tamano = 1 + _tamano(nodo.izquierdo) + _tamano(nodo.derecho)
+
+    def _rotar_derecha(self, nodo: NodoArbol[K, T]) -> NodoArbol[K, T]:
+        pivote = nodo.izquierdo
+        nodo.izquierdo = pivote.derecho
+        pivote.derecho = nodo
+        self._actualizar(nodo)
+        self._actualizar(pivote)
+        return pivote
+
+    def _rotar_izquierda(self, nodo: NodoArbol[K, T]) -> NodoArbol[K, T]:
+        pivote = nodo.derecho
+        nodo.derecho = pivote.izquierdo
+        pivote.izquierdo = nodo
+        self._actualizar(nodo)
+        self._actualizar(pivote)
+        return pivote
+
+    def _rebalancear(self, nodo: NodoArbol[K, T]) -> NodoArbol[K, T]:
+        """Recalcula la altura del nodo y aplica la rotación simple o doble que corresponda."""
+        self._actualizar(nodo)
+        factor = _altura(nodo.izquierdo) - _altura(nodo.derecho)
+        if factor > 1:
+            if _altura(nodo.izquierdo.izquierdo) < _altura(nodo.izquierdo.derecho):
+                nodo.izquierdo = self._rotar_izquierda(nodo.izquierdo)
+            return self._rotar_derecha(nodo)
+        if factor < -1:
+            if _altura(nodo.derecho.derecho) < _altura(nodo.derecho.izquierdo):
+                nodo.derecho = self._rotar_derecha(nodo.derecho)
+            return self._rotar_izquierda(nodo)
+        return nodo
+
+    def _rebalancear_camino(self, camino: List[NodoArbol[K, T]]) -> None:
+        """Sube por los ancestros recorridos rebalanceando cada uno y re-enlazándolo a su padre."""
+        for i in range(len(camino) - 1, -1, -1):
+            nodo = camino[i]
+            nueva_raiz = self._rebalancear(nodo)
+            if nueva_raiz is nodo:
+                continue
+            if i == 0:
+                self.raiz = nueva_raiz
+            elif camino[i - 1].izquierdo is nodo:
+                camino[i - 1].izquierdo = nueva_raiz
             else:
-                self._insertar_recursivo(nodo.derecho, clave, valor)
+                camino[i - 1].derecho = nueva_raiz
+
+    def altura(self) -> int:
+        """Altura del árbol (número de niveles); 0 si está vacío."""
+        if self.balanceo == "avl":
+            return _altura(self.raiz)
+        pendientes, altura = [(self.raiz, 1)], 0
+        while pendientes:
+            nodo, profundidad = pendientes.pop()
+            if nodo:
+                altura = max(altura, profundidad)
+                pendientes.append((nodo.izquierdo, profundidad + 1))
+                pendientes.append((nodo.derecho, profundidad + 1))
+        return altura
 
     def buscar(self, clave: K) -> Optional[T]:
         """Busca un valor por su clave. Retorna None si no lo encuentra."""
-        return self._buscar_recursivo(self.raiz, clave)
+        nodo = self.raiz
+        while nodo is not None:
+            if clave == nodo.clave:
+                return nodo.valor
+            nodo = nodo.izquierdo if clave < nodo.clave else nodo.derecho
+        return None
+
+    def recorrer_inorden(self) -> List[T]:
+        """Recorre el árbol en orden (inorden) y devuelve una lista con los valores."""
+        return list(self.iter_inorden())
+
+    def iter_inorden(self, desde: int = 0) -> Iterator[T]:
+        """Generador perezoso del recorrido inorden; usa una pila explícita en lugar de recursión.
+        Con desde=k empieza en la posición k (base 0) en O(log n), útil para paginar.
+        """
+        pila: List[NodoArbol[K, T]] = []
+        nodo = self.raiz
+        # Descender hasta la posición inicial apilando los ancestros pendientes
+        while nodo is not None:
+            izquierdos = _tamano(nodo.izquierdo)
+            if desde <= izquierdos:
+                pila.append(nodo)
+                if desde == izquierdos:
+                    break
+                nodo = nodo.izquierdo
+            else:
+                desde -= izquierdos + 1
+                nodo = nodo.derecho
+        nodo = None
+        while pila or nodo is not None:
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.izquierdo
+            nodo = pila.pop()
+            yield nodo.valor
+            nodo = nodo.derecho
+
+    # ---------------------- Consultas ordenadas ----------------------
+    def rango(self, lo: K, hi: K) -> Iterator[T]:
+        """Valores con lo <= clave <= hi en orden; solo visita las ramas que pueden aportar."""
+        pila: List[NodoArbol[K, T]] = []
+        nodo = self.raiz
+        while pila or nodo is not None:
+            while nodo is not None:
+                if nodo.clave < lo:
+                    nodo = nodo.derecho
+                else:
+                    pila.append(nodo)
+                    nodo = nodo.izquierdo
+            if not pila:
+                return
+            nodo = pila.pop()
+            if hi < nodo.clave:
+                return
+            yield nodo.valor
+            nodo = nodo.derecho
 
-    def _buscar_recursivo(self, nodo: Optional[NodoArbol[K, T]], clave: K) -> Optional[T]:
-        """Método auxiliar recursivo para buscar un nodo."""
+    def floor(self, clave: K) -> Optional[T]:
+        """Valor con la mayor clave <= clave, o None."""
+        candidato: Optional[NodoArbol[K, T]] = None
+        nodo = self.raiz
+        while nodo is not None:
+            if clave < nodo.clave:
+                nodo = nodo.izquierdo
+            else:
+                candidato, nodo = nodo, nodo.derecho
+        return candidato.valor if candidato else None
+
+    def ceiling(self, clave: K) -> Optional[T]:
+        """Valor con la menor clave >= clave, o None."""
+        candidato: Optional[NodoArbol[K, T]] = None
+        nodo = self.raiz
+        while nodo is not None:
+            if nodo.clave < clave:
+                nodo = nodo.derecho
+            else:
+                candidato, nodo = nodo, nodo.izquierdo
+        return candidato.valor if candidato else None
+
+    def min(self) -> Optional[T]:
+        nodo = self.raiz
         if nodo is None:
             return None
-        if clave == nodo.clave:
-            return nodo.valor
-        if clave < nodo.clave:
-            return self._buscar_recursivo(nodo.izquierdo, clave)
-        return self._buscar_recursivo(nodo.derecho, clave)
+        while nodo.izquierdo is not None:
+            nodo = nodo.izquierdo
+        return nodo.valor
 
-    def recorrer_inorden(self) -> List[T]:
-        """Recorre el árbol en orden (inorden) y devuelve una lista con los valores."""
+    def max(self) -> Optional[T]:
+        nodo = self.raiz
+        if nodo is None:
+            return None
+        while nodo.derecho is not None:
+            nodo = nodo.derecho
+        return nodo.valor
+
+    def k_esimo(self, k: int) -> Optional[T]:
+        """Valor en la posición k (base 0) del recorrido inorden, o None si k está fuera de rango."""
+        if k < 0:
+            return None
+        nodo = self.raiz
+        while nodo is not None:
+            izquierdos = _tamano(nodo.izquierdo)
+            if k < izquierdos:
+                nodo = nodo.izquierdo
+            elif k == izquierdos:
+                return nodo.valor
+            else:
+                k -= izquierdos + 1
+                nodo = nodo.derecho
+        return None
+
+    def rank(self, clave: K) -> int:
+        """Cantidad de claves estrictamente menores que clave."""
+        menores = 0
+        nodo = self.raiz
+        while nodo is not None:
+            if clave <= nodo.clave:
+                nodo = nodo.izquierdo
+            else:
+                menores += _tamano(nodo.izquierdo) + 1
+                nodo = nodo.derecho
+        return menores
+
+
+class NodoTrie(Generic[T]):
+    """Nodo del árbol de prefijos: un hijo por carácter y los valores cuya clave termina aquí."""
+    def __init__(self) -> None:
+        self.hijos: Dict[str, NodoTrie[T]] = {}
+        self.valores: List[T] = []
+
+class ArbolPrefijos(Generic[T]):
+    """
+    Árbol de prefijos (trie) con claves de texto.
+    - Insertar y eliminar en O(longitud de la clave).
+    - Buscar por prefijo en O(longitud del prefijo + k) para k resultados,
+      entregados en orden alfabético de clave.
+    """
+    def __init__(self) -> None:
+        self.raiz: NodoTrie[T] = NodoTrie()
+        self._tamano = 0
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def insertar(self, clave: str, valor: T) -> None:
+        nodo = self.raiz
+        for caracter in clave:
+            siguiente = nodo.hijos.get(caracter)
+            if siguiente is None:
+                siguiente = nodo.hijos[caracter] = NodoTrie()
+            nodo = siguiente
+        nodo.valores.append(valor)
+        self._tamano += 1
+
+    def eliminar(self, clave: str, valor: T) -> bool:
+        """Elimina el valor asociado a la clave y poda las ramas que quedan vacías."""
+        camino: List[Tuple[NodoTrie[T], str]] = []
+        nodo = self.raiz
+        for caracter in clave:
+            siguiente = nodo.hijos.get(caracter)
+            if siguiente is None:
+                return False
+            camino.append((nodo, caracter))
+            nodo = siguiente
+        for i, existente in enumerate(nodo.valores):
+            if existente is valor or existente == valor:
+                del nodo.valores[i]
+                break
+        else:
+            return False
+        self._tamano -= 1
+        while camino and not nodo.valores and not nodo.hijos:
+            padre, caracter = camino.pop()
+            del padre.hijos[caracter]
+            nodo = padre
+        return True
+
+    def buscar_prefijo(self, prefijo: str, limite: Optional[int] = None) -> List[T]:
+        """Devuelve hasta `limite` valores cuya clave empieza por prefijo."""
+        nodo = self.raiz
+        for caracter in prefijo:
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return []
         resultado: List[T] = []
-        self._inorden_recursivo(self.raiz, resultado)
-        return resultado
-
-    def _inorden_recursivo(self, nodo: Optional[NodoArbol[K, T]], resultado: List[T]) -> None:
-        """Método auxiliar recursivo para recorrer el árbol en orden."""
-        if nodo:
-            self._inorden_recursivo(nodo.izquierdo, resultado)
-            resultado.append(nodo.valor)
-            self._inorden_recursivo(nodo.derecho, resultado)
+        pila = [nodo]
+        while pila and (limite is None or len(resultado) < limite):
+            nodo = pila.pop()
+            resultado.extend(nodo.valores)
+            # Se apilan en orden inverso para visitar los hijos alfabéticamente
+            pila.extend(nodo.hijos[c] for c in sorted(nodo.hijos, reverse=True))
+        return resultado if limite is None else resultado[:limite]
@@ -3,15 +3,22 @@
 Implementaciones de Estructuras de Datos Lineales:
 - ArrayList (envoltura de list)
 - SinglyLinkedList (Lista Enlazada Simple)
+- IndexedLinkedList (Lista Enlazada Doble con índice hash por clave)
 - Stack (Pila)
-- Queue (Cola)
+- Queue (Cola, sobre deque)
+- MinHeap (Montículo binario de mínimos)
+- RingBuffer (Buffer circular de capacidad fija)
 Estas implementaciones son simples y adecuadas para un prototipo académico.
 """
 from __future__ import annotations
+import heapq
+import sys
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar, List
+from typing import Any, Callable, Deque, Dict, Generic, Iterable, Iterator, Optional, TypeVar, List
 
 T = TypeVar("T")
+K = TypeVar("K")
 
 class ArrayList(Generic[T]):
     """
@@ -61,22 +68,109 @@ class ArrayList(Generic[T]):
         else:
             self._data.sort()
 
+    def _key(self, value: T) -> Any:
+        return self._key_fn(value) if self._key_fn else value
+
+    def _bisect_left(self, key_value: Any, lo: int = 0) -> int:
+        """Primer índice desde lo cuya clave es >= key_value (arreglo ordenado)."""
+        # Ruta caliente (cada préstamo y devolución): clave y datos en locales, sin llamadas extra por sondeo
+        data, key = self._data, self._key_fn
+        hi = len(data)
+        if key is None:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if data[mid] < key_value:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(data[mid]) < key_value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _bisect_right(self, key_value: Any) -> int:
+        """Primer índice cuya clave es > key_value (arreglo ordenado)."""
+        data, key = self._data, self._key_fn
+        lo, hi = 0, len(data)
+        if key is None:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if key_value < data[mid]:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            return lo
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key_value < key(data[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def insert_sorted(self, value: T) -> int:
+        """Inserta manteniendo el orden por key_fn (búsqueda binaria + desplazamiento).
+        Los duplicados quedan después de los existentes. Devuelve el índice usado.
+        """
+        idx = self._bisect_right(self._key(value))
+        self._data.insert(idx, value)
+        return idx
+
+    def extend_sorted(self, values: Iterable[T]) -> None:
+        """Agrega un lote manteniendo el orden: una sola ordenación por lote.
+        El lote se ordena aparte y luego se fusiona con el arreglo; Timsort detecta
+        las dos corridas ya ordenadas y las mezcla en tiempo lineal.
+        """
+        lote = sorted(values, key=self._key_fn)
+        if not lote:
+            return
+        if not self._data or self._key(self._data[-1]) <= self._key(lote[0]):
+            self._data.extend(lote)
+            return
+        self._data.extend(lote)
+        self.sort_inplace()
+
+    def iter_range(self, lo: Any, hi: Any) -> Iterator[T]:
+        """Recorre en orden los elementos con lo <= key_fn(x) <= hi (arreglo ordenado)."""
+        for i in range(self._bisect_left(lo), self._bisect_right(hi)):
+            yield self._data[i]
+
+    def remove_sorted(self, key_value: Any, predicate: Callable[[T], bool]) -> Optional[T]:
+        """Elimina el primer elemento con esa clave que cumpla predicate.
+        Solo revisa el tramo de elementos con clave igual (búsqueda binaria).
+        """
+        for i in range(self._bisect_left(key_value), self._bisect_right(key_value)):
+            if predicate(self._data[i]):
+                return self._data.pop(i)
+        return None
+
+    def search_sorted_many(self, key_values: Iterable[Any]) -> Dict[Any, int]:
+        """Índice del primer elemento de cada clave (o -1) con un solo recorrido:
+        las claves se ordenan y cada búsqueda binaria arranca donde terminó la anterior.
+        """
+        if not self._key_fn:
+            raise ValueError("search_sorted_many requiere key_fn definido")
+        resultado: Dict[Any, int] = {}
+        idx = 0
+        for key_value in sorted(set(key_values)):
+            idx = self._bisect_left(key_value, idx)
+            encontrado = idx < len(self._data) and self._key_fn(self._data[idx]) == key_value
+            resultado[key_value] = idx if encontrado else -1
+        return resultado
+
     def binary_search_index(self, key_value: Any) -> int:
         """Devuelve el índice del primer elemento cuyo key_fn(x)==key_value, o -1 si no existe.
         Requiere que el arreglo esté ordenado por esa clave.
         """
         if not self._key_fn:
             raise ValueError("binary_search_index requiere key_fn definido")
-        lo, hi = 0, len(self._data) - 1
-        while lo <= hi:
-            mid = (lo + hi) // 2
-            k = self._key_fn(self._data[mid])
-            if k == key_value:
-                return mid
-            elif k < key_value:
-                lo = mid + 1
-            else:
-                hi = mid - 1
+        idx = self._bisect_left(key_value)
+        if idx < len(self._data) and self._key_fn(self._data[idx]) == key_value:
+            return idx
         return -1
 
 
@@ -128,6 +222,79 @@ class SinglyLinkedList(Generic[T]):
         return None
 
 
+@dataclass
+class _DNode(Generic[T]):
+    value: T
+    prev: Optional["_DNode[T]"] = None
+    next: Optional["_DNode[T]"] = None
+
+class IndexedLinkedList(Generic[K, T]):
+    """
+    Lista enlazada doble con un diccionario clave -> nodo.
+    Conserva el orden de la lista (inserción en cabecera) y permite buscar y
+    eliminar por clave en O(1). Las claves son únicas: insertar una clave
+    existente reemplaza el elemento anterior.
+    """
+    def __init__(self, key_fn: Callable[[T], K]) -> None:
+        self.head: Optional[_DNode[T]] = None
+        self._key_fn = key_fn
+        self._index: Dict[K, _DNode[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[T]:
+        cur = self.head
+        while cur:
+            yield cur.value
+            cur = cur.next
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._index
+
+    def push_front(self, value: T) -> None:
+        key = self._key_fn(value)
+        if key in self._index:
+            self._unlink(self._index[key])
+        node = _DNode(value=value, next=self.head)
+        if self.head:
+            self.head.prev = node
+        self.head = node
+        self._index[key] = node
+
+    def get(self, key: K) -> Optional[T]:
+        node = self._index.get(key)
+        return node.value if node else None
+
+    def remove(self, key: K) -> Optional[T]:
+        node = self._index.pop(key, None)
+        if node is None:
+            return None
+        self._unlink(node)
+        return node.value
+
+    def _unlink(self, node: _DNode[T]) -> None:
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+
+    def find_first(self, predicate: Callable[[T], bool]) -> Optional[T]:
+        for value in self:
+            if predicate(value):
+                return value
+        return None
+
+    def remove_first(self, predicate: Callable[[T], bool]) -> Optional[T]:
+        value = self.find_first(predicate)
+        if value is None:
+            return None
+        return self.remove(self._key_fn(value))
+
+
 class Stack(Generic[T]):
     """Pila con lista subyacente (LIFO)."""
     def __init__(self) -> None:
@@ -151,25 +318,149 @@ class Stack(Generic[T]):
 
 
 class Queue(Generic[T]):
-    """Cola simple (FIFO) basada en lista. Para prototipo académico es suficiente."""
-    def __init__(self) -> None:
-        self._data: List[T] = []
+    """
+    Cola (FIFO) sobre collections.deque: enqueue y dequeue en O(1).
+    Con compact=True los valores str se internan (sys.intern), de modo que un
+    mismo user_id repetido en muchas colas de reserva comparte una sola copia.
+    """
+    def __init__(self, compact: bool = False) -> None:
+        self._data: Deque[T] = deque()
+        self._compact = compact
+
+    def _prepare(self, value: T) -> T:
+        if self._compact and type(value) is str:
+            return sys.intern(value)
+        return value
 
     def enqueue(self, value: T) -> None:
-        self._data.append(value)
+        self._data.append(self._prepare(value))
+
+    def enqueue_many(self, values: Iterable[T]) -> None:
+        if self._compact:
+            values = map(self._prepare, values)
+        self._data.extend(values)
 
     def dequeue(self) -> T:
         if not self._data:
             raise IndexError("dequeue from empty queue")
-        return self._data.pop(0)
+        return self._data.popleft()
+
+    def dequeue_many(self, count: int) -> List[T]:
+        """Extrae hasta count elementos en orden FIFO (menos si la cola se vacía)."""
+        popleft = self._data.popleft
+        return [popleft() for _ in range(min(count, len(self._data)))]
 
     def peek(self) -> T:
         if not self._data:
             raise IndexError("peek from empty queue")
         return self._data[0]
 
+    def to_list(self) -> List[T]:
+        """Elementos en orden de atención (frente primero)."""
+        return list(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def is_empty(self) -> bool:
+        return len(self._data) == 0
+
+
+class MinHeap(Generic[T]):
+    """
+    Montículo binario de mínimos sobre list (módulo heapq): push y pop en
+    O(log n), peek en O(1). Los elementos deben ser comparables entre sí
+    (por ejemplo, tuplas (prioridad, id)).
+    """
+    def __init__(self, iterable: Optional[Iterable[T]] = None) -> None:
+        self._data: List[T] = list(iterable) if iterable is not None else []
+        heapq.heapify(self._data)
+
+    def push(self, value: T) -> None:
+        heapq.heappush(self._data, value)
+
+    def pop(self) -> T:
+        if not self._data:
+            raise IndexError("pop from empty heap")
+        return heapq.heappop(self._data)
+
+    def peek(self) -> T:
+        if not self._data:
+            raise IndexError("peek from empty heap")
+        return self._data[0]
+
+    def iter_menores(self, limite: Any) -> Iterator[T]:
+        """
+        Recorre en orden ascendente los elementos < limite sin extraerlos.
+        Explora el árbol de mejor a peor con un montículo auxiliar de índices:
+        O(k log k) para k resultados, sin importar el tamaño del montículo.
+        """
+        data = self._data
+        if not data or not data[0] < limite:
+            return
+        frontera = [(data[0], 0)]
+        while frontera:
+            valor, i = heapq.heappop(frontera)
+            yield valor
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < len(data) and data[hijo] < limite:
+                    heapq.heappush(frontera, (data[hijo], hijo))
+
     def __len__(self) -> int:
         return len(self._data)
 
     def is_empty(self) -> bool:
         return len(self._data) == 0
+
+
+class RingBuffer(Generic[T]):
+    """
+    Buffer circular de capacidad fija sobre una lista preasignada: push es O(1)
+    y, con el buffer lleno, sobrescribe (y devuelve) el elemento más antiguo.
+    """
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity debe ser positiva")
+        self._data: List[Optional[T]] = [None] * capacity
+        self._start = 0  # posición del más antiguo
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def push(self, value: T) -> Optional[T]:
+        """Agrega value como el más reciente; devuelve el elemento desalojado o None."""
+        capacity = len(self._data)
+        if self._size < capacity:
+            self._data[(self._start + self._size) % capacity] = value
+            self._size += 1
+            return None
+        evicted = self._data[self._start]
+        self._data[self._start] = value
+        self._start = (self._start + 1) % capacity
+        return evicted
+
+    def peek(self) -> T:
+        """Elemento más reciente."""
+        if not self._size:
+            raise IndexError("peek from empty ring buffer")
+        return self._data[(self._start + self._size - 1) % len(self._data)]
+
+    def latest(self, count: int) -> List[T]:
+        """Los count elementos más recientes, del más nuevo al más viejo."""
+        capacity = len(self._data)
+        last = self._start + self._size - 1
+        return [self._data[(last - i) % capacity] for i in range(min(count, self._size))]
+
+    def __iter__(self) -> Iterator[T]:
+        """Del más antiguo al más reciente."""
+        capacity = len(self._data)
+        for i in range(self._size):
+            yield self._data[(self._start + i) % capacity]
+
+    def to_list(self) -> List[T]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,133 @@
+"""
+Tabla de préstamos en columnas (struct-of-arrays).
+
+En lugar de un objeto Loan por préstamo, cada campo se guarda en su propia
+columna: las fechas como ordinales en array('i') (4 bytes por fecha en vez de
+un objeto date) y los user_id / ISBN internados, de modo que todos los
+préstamos de un mismo libro comparten una sola cadena. Pensada para volúmenes
+grandes de préstamos que casi no cambian (por ejemplo, préstamos ya devueltos).
+"""
+from __future__ import annotations
+import sys
+from array import array
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from src.modelos.models import Loan
+
+# date.min.toordinal() == 1, así que 0 queda libre para "sin fecha"
+_SIN_FECHA = 0
+
+
+class FilaPrestamo:
+    """
+    Vista de una fila de LoanTable con los mismos atributos que Loan.
+    Leer o escribir un atributo lee o escribe directamente la columna.
+    """
+    __slots__ = ("_tabla", "_fila")
+
+    def __init__(self, tabla: LoanTable, fila: int) -> None:
+        self._tabla = tabla
+        self._fila = fila
+
+    @property
+    def loan_id(self) -> str:
+        return self._tabla._loan_ids[self._fila]
+
+    @property
+    def user_id(self) -> str:
+        return self._tabla._user_ids[self._fila]
+
+    @property
+    def isbn(self) -> str:
+        return self._tabla._isbns[self._fila]
+
+    @property
+    def fecha_prestamo(self) -> date:
+        return date.fromordinal(self._tabla._fecha_prestamo[self._fila])
+
+    @property
+    def fecha_devolucion_estimada(self) -> date:
+        return date.fromordinal(self._tabla._fecha_estimada[self._fila])
+
+    @fecha_devolucion_estimada.setter
+    def fecha_devolucion_estimada(self, valor: date) -> None:
+        self._tabla._fecha_estimada[self._fila] = valor.toordinal()
+
+    @property
+    def fecha_devolucion_real(self) -> Optional[date]:
+        ordinal = self._tabla._fecha_real[self._fila]
+        return None if ordinal == _SIN_FECHA else date.fromordinal(ordinal)
+
+    @fecha_devolucion_real.setter
+    def fecha_devolucion_real(self, valor: Optional[date]) -> None:
+        self._tabla._fecha_real[self._fila] = _SIN_FECHA if valor is None else valor.toordinal()
+
+    @property
+    def devuelto(self) -> bool:
+        return bool(self._tabla._devuelto[self._fila])
+
+    @devuelto.setter
+    def devuelto(self, valor: bool) -> None:
+        self._tabla._devuelto[self._fila] = 1 if valor else 0
+
+    def marcar_devuelto(self) -> None:
+        self.devuelto = True
+        self.fecha_devolucion_real = date.today()
+
+    def a_loan(self) -> Loan:
+        """Copia independiente de la fila como Loan."""
+        return Loan(self.loan_id, self.user_id, self.isbn, self.fecha_prestamo,
+                    self.fecha_devolucion_estimada, self.fecha_devolucion_real, self.devuelto)
+
+    def __repr__(self) -> str:
+        return f"FilaPrestamo({self.a_loan()!r})"
+
+
+class LoanTable:
+    """
+    Préstamos almacenados por columnas, indexados por loan_id.
+    Solo admite altas (no hay eliminación): las filas no se desplazan y cada
+    FilaPrestamo entregada sigue siendo válida.
+    """
+    def __init__(self) -> None:
+        self._filas: Dict[str, int] = {}  # loan_id -> número de fila
+        self._loan_ids: List[str] = []
+        self._user_ids: List[str] = []
+        self._isbns: List[str] = []
+        self._fecha_prestamo = array('i')
+        self._fecha_estimada = array('i')
+        self._fecha_real = array('i')
+        self._devuelto = array('b')
+
+    def __len__(self) -> int:
+        return len(self._loan_ids)
+
+    def __contains__(self, loan_id: str) -> bool:
+        return loan_id in self._filas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loan_ids)
+
+    def agregar(self, prestamo: Loan) -> None:
+        """Agrega un préstamo (Loan o FilaPrestamo). Lanza KeyError si el loan_id ya existe."""
+        if prestamo.loan_id in self._filas:
+            raise KeyError(f"loan_id duplicado: {prestamo.loan_id}")
+        self._filas[prestamo.loan_id] = len(self._loan_ids)
+        self._loan_ids.append(prestamo.loan_id)
+        self._user_ids.append(sys.intern(prestamo.user_id))
+        self._isbns.append(sys.intern(prestamo.isbn))
+        self._fecha_prestamo.append(prestamo.fecha_prestamo.toordinal())
+        self._fecha_estimada.append(prestamo.fecha_devolucion_estimada.toordinal())
+        real = prestamo.fecha_devolucion_real
+        self._fecha_real.append(_SIN_FECHA if real is None else real.toordinal())
+        self._devuelto.append(1 if prestamo.devuelto else 0)
+
+    def get(self, loan_id: str) -> Optional[FilaPrestamo]:
+        fila = self._filas.get(loan_id)
+        return None if fila is None else FilaPrestamo(self, fila)
+
+    def values(self) -> Iterator[FilaPrestamo]:
+        """Filas en orden de alta."""
+        for fila in range(len(self._loan_ids)):
+            yield FilaPrestamo(self, fila)
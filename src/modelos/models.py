@@ -1,9 +1,15 @@
 
+import sys
 from dataclasses import dataclass, field
 from datetime import date, timedelta
 from typing import Optional
 
-@dataclass
+# Con __slots__ cada instancia deja de llevar su propio __dict__: a millones de
+# préstamos ese ahorro domina la memoria del proceso. dataclass(slots=True)
+# existe desde Python 3.10; en versiones anteriores las clases quedan como antes.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class Book:
     isbn: str
     titulo: str
@@ -15,13 +21,13 @@ class Book:
     # pero dejamos un flag simple para saber si hay reservas pendientes.
     tiene_reservas: bool = False
 
-@dataclass
+@dataclass(**_SLOTS)
 class User:
     user_id: str  # p. ej. documento o código institucional
     nombre: str
     email: str
 
-@dataclass
+@dataclass(**_SLOTS)
 class Loan:
     loan_id: str
     user_id: str
@@ -35,14 +41,14 @@ class Loan:
         self.devuelto = True
         self.fecha_devolucion_real = date.today()
 
-@dataclass
+@dataclass(**_SLOTS)
 class Editorial:
     id: str
     nombre: str
     pais: str
     anio_fundacion: int
 
-@dataclass
+@dataclass(**_SLOTS)
 class Genero:
     id: str
     nombre: str
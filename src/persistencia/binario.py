@@ -0,0 +1,166 @@
+"""
+Formato binario columnar para instantáneas de catálogos.
+
+Disposición del archivo (enteros en little-endian):
+    MAGIA (4 bytes) | versión (u16) | crc32 del contenido (u32) | contenido
+
+Contenido:
+    nombre de la clase (u32 longitud + utf-8)
+    cantidad de registros (u64), cantidad de campos (u16)
+    tabla de cadenas internadas: n (u32), longitudes en caracteres (n x u32),
+        bytes del bloque (u64) + bloque utf-8 con todas las cadenas concatenadas
+    por cada campo: nombre (u16 + utf-8), tipo (1 byte), bytes (u64) + columna
+
+Cada columna se guarda con un tipo homogéneo para poder decodificarla con
+array.frombytes en lugar de valor a valor:
+    'q' enteros (i64), 'b' booleanos (1 byte), 's' cadenas o None (índice u32
+    en la tabla), 'd' fechas o None (ordinal i32, 0 = None) y 'j' cualquier
+    otra mezcla de valores, como lista JSON.
+Las cadenas repetidas (país, autor, user_id...) se guardan una sola vez.
+"""
+import json
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import fields
+from datetime import date
+from typing import Any, Dict, Iterable, List, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+MAGIA = b"EDBC"
+VERSION = 1
+_NULO = 0xFFFFFFFF  # índice de cadena reservado para None
+_CABECERA = struct.Struct("<4sHI")
+
+
+def _a_bytes(columna: array) -> bytes:
+    if sys.byteorder == "big":
+        columna = array(columna.typecode, columna)
+        columna.byteswap()
+    return columna.tobytes()
+
+
+def _desde_bytes(tipo: str, datos: bytes) -> array:
+    columna = array(tipo)
+    columna.frombytes(datos)
+    if sys.byteorder == "big":
+        columna.byteswap()
+    return columna
+
+
+def _tipo_columna(valores: List[Any]) -> str:
+    tipos = {type(v) for v in valores}
+    if tipos <= {int} and tipos:
+        return "q"
+    if tipos <= {bool} and tipos:
+        return "b"
+    if tipos <= {str, type(None)}:
+        return "s"
+    if tipos <= {date, type(None)}:
+        return "d"
+    return "j"
+
+
+def codificar(objetos: Iterable[Any], clase: Type[T]) -> bytes:
+    """Serializa objetos dataclass de una misma clase al formato binario."""
+    nombres = [f.name for f in fields(clase) if f.init]
+    filas = [tuple(getattr(obj, n) for n in nombres) for obj in objetos]
+    columnas = list(zip(*filas)) if filas else [() for _ in nombres]
+
+    tabla: Dict[str, int] = {}
+    partes: List[bytes] = []
+    for nombre, valores in zip(nombres, columnas):
+        valores = list(valores)
+        tipo = _tipo_columna(valores)
+        if tipo == "q":
+            datos = _a_bytes(array("q", valores))
+        elif tipo == "b":
+            datos = bytes(valores)
+        elif tipo == "s":
+            datos = _a_bytes(array("I", (_NULO if v is None else tabla.setdefault(v, len(tabla)) for v in valores)))
+        elif tipo == "d":
+            datos = _a_bytes(array("i", (0 if v is None else v.toordinal() for v in valores)))
+        else:
+            datos = json.dumps(valores, ensure_ascii=False, default=str).encode("utf-8")
+        nombre_b = nombre.encode("utf-8")
+        partes.append(struct.pack("<H", len(nombre_b)) + nombre_b + tipo.encode("ascii")
+                      + struct.pack("<Q", len(datos)) + datos)
+
+    cadenas = list(tabla)  # en orden de índice
+    bloque = "".join(cadenas).encode("utf-8")
+    clase_b = clase.__name__.encode("utf-8")
+    contenido = b"".join([
+        struct.pack("<I", len(clase_b)), clase_b,
+        struct.pack("<QH", len(filas), len(nombres)),
+        struct.pack("<I", len(cadenas)), _a_bytes(array("I", map(len, cadenas))),
+        struct.pack("<Q", len(bloque)), bloque,
+        *partes,
+    ])
+    return _CABECERA.pack(MAGIA, VERSION, zlib.crc32(contenido)) + contenido
+
+
+def decodificar(datos: bytes, clase: Type[T]) -> List[T]:
+    """Reconstruye los objetos; lanza ValueError si el archivo está dañado o no corresponde."""
+    if len(datos) < _CABECERA.size:
+        raise ValueError("instantánea binaria truncada")
+    magia, version, crc = _CABECERA.unpack_from(datos)
+    if magia != MAGIA:
+        raise ValueError("no es una instantánea binaria")
+    if version != VERSION:
+        raise ValueError(f"versión de instantánea no soportada: {version}")
+    contenido = memoryview(datos)[_CABECERA.size:]
+    if zlib.crc32(contenido) != crc:
+        raise ValueError("suma de verificación inválida: instantánea dañada")
+
+    pos = 0
+
+    def leer(formato: str) -> Tuple[Any, ...]:
+        nonlocal pos
+        valores = struct.unpack_from(formato, contenido, pos)
+        pos += struct.calcsize(formato)
+        return valores
+
+    def leer_bytes(n: int) -> bytes:
+        nonlocal pos
+        pos += n
+        return bytes(contenido[pos - n:pos])
+
+    (largo,) = leer("<I")
+    nombre_clase = leer_bytes(largo).decode("utf-8")
+    if nombre_clase != clase.__name__:
+        raise ValueError(f"la instantánea contiene {nombre_clase}, no {clase.__name__}")
+    n_filas, n_campos = leer("<QH")
+    (n_cadenas,) = leer("<I")
+    longitudes = _desde_bytes("I", leer_bytes(4 * n_cadenas))
+    (largo,) = leer("<Q")
+    bloque = leer_bytes(largo).decode("utf-8")
+    cadenas: List[str] = []
+    inicio = 0
+    for longitud in longitudes:
+        cadenas.append(bloque[inicio:inicio + longitud])
+        inicio += longitud
+
+    columnas: Dict[str, List[Any]] = {}
+    for _ in range(n_campos):
+        (largo,) = leer("<H")
+        nombre = leer_bytes(largo).decode("utf-8")
+        tipo = leer_bytes(1).decode("ascii")
+        (largo,) = leer("<Q")
+        crudo = leer_bytes(largo)
+        if tipo == "q":
+            columnas[nombre] = _desde_bytes("q", crudo).tolist()
+        elif tipo == "b":
+            columnas[nombre] = [bool(b) for b in crudo]
+        elif tipo == "s":
+            columnas[nombre] = [None if i == _NULO else cadenas[i] for i in _desde_bytes("I", crudo)]
+        elif tipo == "d":
+            columnas[nombre] = [date.fromordinal(o) if o else None for o in _desde_bytes("i", crudo)]
+        else:
+            columnas[nombre] = json.loads(crudo.decode("utf-8"))
+
+    nombres = [f.name for f in fields(clase) if f.init]
+    if n_filas == 0:
+        return []
+    return [clase(*fila) for fila in zip(*(columnas[n] for n in nombres))]
@@ -0,0 +1,143 @@
+"""
+Índice ordenado de solo lectura sobre disco, consultado con mmap.
+
+Permite un arranque en frío sin reconstruir árboles: el archivo se abre con
+mmap y cada búsqueda hace una búsqueda binaria directamente sobre la tabla de
+entradas, decodificando solo el registro encontrado.
+
+Disposición del archivo (little-endian):
+    MAGIA (4 bytes) | versión (u16) | firma del origen (u32) | cantidad de entradas n (u64)
+    tabla de n entradas de tamaño fijo, ordenadas por clave (bytes utf-8):
+        desplazamiento de la clave (u64), largo de la clave (u32),
+        desplazamiento del registro (u64), largo del registro (u32)
+    bloque de datos: claves y registros (JSON compacto de cada objeto)
+
+La firma del origen (firma_archivos) identifica la versión de los archivos a
+partir de los que se armó el índice; quien lo abre puede compararla con la
+actual y descartar un índice desactualizado.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import asdict
+from typing import Any, Generic, Iterable, Iterator, List, Optional, Tuple, Type, TypeVar
+from src.persistencia.persistencia import escritura_atomica
+
+T = TypeVar('T')
+
+MAGIA = b"EDBI"
+VERSION = 2
+_CABECERA = struct.Struct("<4sHIQ")
+_ENTRADA = struct.Struct("<QIQI")
+
+
+def firma_archivos(*rutas: str) -> int:
+    """Firma (crc32) del tamaño y la fecha de modificación de los archivos; los que no existen también cuentan."""
+    partes = []
+    for ruta in rutas:
+        try:
+            estado = os.stat(ruta)
+            partes.append(f"{estado.st_size}:{estado.st_mtime_ns}")
+        except FileNotFoundError:
+            partes.append("-")
+    return zlib.crc32("|".join(partes).encode("utf-8"))
+
+
+def construir_indice(pares: Iterable[Tuple[str, Any]], ruta_archivo: str, firma: int = 0) -> int:
+    """
+    Escribe el índice a partir de pares (clave, objeto dataclass).
+    Los pares se ordenan por clave si no vienen ordenados.
+    
+    Args:
+        pares: Pares (clave, objeto)
+        ruta_archivo: Ruta del índice
+        firma: Firma de los archivos de origen (ver firma_archivos)
+    
+    Returns:
+        Cantidad de entradas escritas
+    """
+    codificados = sorted(
+        (clave.encode("utf-8"), json.dumps(asdict(obj), ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        for clave, obj in pares
+    )
+    inicio_datos = _CABECERA.size + _ENTRADA.size * len(codificados)
+    tabla: List[bytes] = []
+    datos: List[bytes] = []
+    pos = inicio_datos
+    for clave, registro in codificados:
+        tabla.append(_ENTRADA.pack(pos, len(clave), pos + len(clave), len(registro)))
+        datos.append(clave)
+        datos.append(registro)
+        pos += len(clave) + len(registro)
+    with escritura_atomica(ruta_archivo, 'wb') as archivo:
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, firma, len(codificados)))
+        archivo.write(b"".join(tabla))
+        archivo.write(b"".join(datos))
+    return len(codificados)
+
+
+class IndiceMmap(Generic[T]):
+    """
+    Índice abierto en modo de solo lectura. buscar() cuesta O(log n) accesos a
+    la tabla (páginas que el sistema operativo carga bajo demanda) y decodifica
+    un único registro, sin importar el tamaño del catálogo.
+    """
+    def __init__(self, ruta_archivo: str, clase: Type[T]) -> None:
+        self._clase = clase
+        self._archivo = open(ruta_archivo, 'rb')
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._archivo.close()
+            raise ValueError(f"{ruta_archivo} no es un índice válido")
+        magia, version, self.firma, self._n = (_CABECERA.unpack_from(self._mapa, 0) if len(self._mapa) >= _CABECERA.size
+                                               else (b"", 0, 0, 0))
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{ruta_archivo} no es un índice válido (versión {VERSION})")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __enter__(self) -> "IndiceMmap[T]":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        self._mapa.close()
+        self._archivo.close()
+
+    def _entrada(self, i: int) -> Tuple[int, int, int, int]:
+        return _ENTRADA.unpack_from(self._mapa, _CABECERA.size + i * _ENTRADA.size)
+
+    def _clave(self, i: int) -> bytes:
+        pos, largo, _, _ = self._entrada(i)
+        return self._mapa[pos:pos + largo]
+
+    def _registro(self, i: int) -> T:
+        _, _, pos, largo = self._entrada(i)
+        return self._clase(**json.loads(self._mapa[pos:pos + largo].decode("utf-8")))
+
+    def buscar(self, clave: str) -> Optional[T]:
+        """Decodifica el registro con esa clave (búsqueda binaria sobre el mmap), o None."""
+        objetivo = clave.encode("utf-8")
+        lo, hi = 0, self._n - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            actual = self._clave(mid)
+            if actual == objetivo:
+                return self._registro(mid)
+            if actual < objetivo:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return None
+
+    def __iter__(self) -> Iterator[T]:
+        """Recorre todos los registros en orden de clave, decodificándolos de a uno."""
+        for i in range(self._n):
+            yield self._registro(i)
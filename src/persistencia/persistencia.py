@@ -1,23 +1,88 @@
 import json
-from typing import List, Dict, Any, Type, TypeVar, Callable
-from dataclasses import asdict
+import os
+import re
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, List, Dict, Any, Optional, Tuple, Type, TypeVar, Callable, get_type_hints
+from dataclasses import asdict, fields, is_dataclass
+from datetime import date
+from src.persistencia import binario
 
 T = TypeVar('T')
 
-def guardar_a_json(objetos: List[Any], ruta_archivo: str) -> None:
+# Espacios y comas entre elementos de un arreglo JSON
+_SEPARADORES = re.compile(r"[\s,]*")
+
+def _leer_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+# Se lee una sola vez: os.umask no permite consultarla sin modificarla
+_UMASK = _leer_umask()
+
+@contextmanager
+def escritura_atomica(ruta_archivo: str, modo: str = 'w') -> Iterator[IO]:
     """
-    Guarda una lista de objetos en un archivo JSON.
+    Escribe en un archivo temporal del mismo directorio y, solo si el bloque
+    termina sin errores, hace fsync y lo renombra sobre el destino. Un corte a
+    mitad de escritura deja intacta la versión anterior del archivo. El
+    resultado conserva los permisos del destino (o, si es nuevo, los de un
+    open() normal) en lugar del 0600 con el que mkstemp crea el temporal.
     
     Args:
-        objetos: Lista de objetos a guardar
+        ruta_archivo: Ruta final del archivo
+        modo: 'w' (texto utf-8) o 'wb' (binario)
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta_archivo))
+    try:
+        permisos = stat.S_IMODE(os.stat(ruta_archivo).st_mode)
+    except FileNotFoundError:
+        permisos = 0o666 & ~_UMASK
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix=f".{os.path.basename(ruta_archivo)}.", suffix=".tmp")
+    codificacion = None if 'b' in modo else 'utf-8'
+    try:
+        with open(descriptor, modo, encoding=codificacion) as archivo:
+            os.chmod(ruta_temporal, permisos)
+            yield archivo
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(ruta_temporal, ruta_archivo)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+    _sincronizar_directorio(directorio)
+
+def _sincronizar_directorio(directorio: str) -> None:
+    """Persiste la entrada del directorio tras un rename (no disponible en Windows)."""
+    try:
+        descriptor = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+def guardar_a_json(objetos: Iterable[Any], ruta_archivo: str) -> None:
+    """
+    Guarda una colección de objetos en un archivo JSON (escritura atómica).
+    Las fechas se escriben como "AAAA-MM-DD".
+    
+    Args:
+        objetos: Lista (o iterable) de objetos a guardar
         ruta_archivo: Ruta del archivo JSON donde guardar los datos
     """
     # Convertir objetos a diccionarios
     datos = [asdict(obj) for obj in objetos]
     
     # Guardar en archivo JSON
-    with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
-        json.dump(datos, archivo, indent=4, ensure_ascii=False)
+    with escritura_atomica(ruta_archivo) as archivo:
+        json.dump(datos, archivo, indent=4, ensure_ascii=False, default=_valor_json)
 
 def cargar_desde_json(ruta_archivo: str, clase: Type[T], constructor: Callable[[Dict[str, Any]], T] = None) -> List[T]:
     """
@@ -30,6 +95,10 @@ def cargar_desde_json(ruta_archivo: str, clase: Type[T], constructor: Callable[[
         
     Returns:
         Lista de objetos de la clase especificada
+        
+    Raises:
+        ValueError: Si el archivo existe pero no es JSON válido (no se devuelve
+            una lista vacía para no sobrescribir después el catálogo con ella)
     """
     try:
         with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
@@ -43,7 +112,286 @@ def cargar_desde_json(ruta_archivo: str, clase: Type[T], constructor: Callable[[
     except FileNotFoundError:
         # Si el archivo no existe, devolver lista vacía
         return []
-    except json.JSONDecodeError:
-        # Si hay error en el formato JSON, devolver lista vacía
-        print(f"Error: El archivo {ruta_archivo} no tiene un formato JSON válido.")
+    except json.JSONDecodeError as error:
+        raise ValueError(f"El archivo {ruta_archivo} no tiene un formato JSON válido.") from error
+
+
+def iterar_desde_json(ruta_archivo: str, clase: Type[T], constructor: Callable[[Dict[str, Any]], T] = None,
+                      tamano_bloque: int = 1 << 16) -> Iterator[T]:
+    """
+    Versión en streaming de cargar_desde_json: entrega los objetos uno a uno
+    leyendo el archivo por bloques, con memoria acotada por el tamaño del
+    objeto más grande y no por el del archivo.
+    
+    Acepta un arreglo JSON ([{...}, {...}]) o un archivo JSON Lines (un
+    objeto por línea); el formato se detecta por el primer carácter.
+    
+    Args:
+        ruta_archivo: Ruta del archivo a leer
+        clase: Clase a la que convertir los datos
+        constructor: Función opcional para construir objetos
+        tamano_bloque: Caracteres leídos en cada lectura
+        
+    Yields:
+        Objetos de la clase especificada
+    """
+    construir = constructor or (lambda item: clase(**item))
+    try:
+        archivo = open(ruta_archivo, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with archivo:
+        buffer = archivo.read(tamano_bloque).lstrip()
+        if not buffer:
+            return
+        if buffer[0] != '[':
+            # JSON Lines: un objeto por línea
+            archivo.seek(0)
+            for numero, linea in enumerate(archivo, start=1):
+                if linea.strip():
+                    try:
+                        item = json.loads(linea)
+                    except json.JSONDecodeError as error:
+                        raise ValueError(f"La línea {numero} de {ruta_archivo} no es JSON válido.") from error
+                    yield construir(item)
+            return
+
+        decodificador = json.JSONDecoder()
+        pos = 1
+        while True:
+            pos = _SEPARADORES.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+            completo = False
+            if pos < len(buffer):
+                try:
+                    item, pos = decodificador.raw_decode(buffer, pos)
+                    completo = True
+                except json.JSONDecodeError:
+                    pass
+            if not completo:
+                # El objeto quedó partido entre bloques: leer más y reintentar
+                bloque = archivo.read(tamano_bloque)
+                if not bloque:
+                    raise ValueError(f"El archivo {ruta_archivo} no tiene un formato JSON válido.")
+                buffer, pos = buffer[pos:] + bloque, 0
+                continue
+            yield construir(item)
+            if pos > tamano_bloque:
+                buffer, pos = buffer[pos:], 0
+
+# ---------------------- Instantáneas (JSON o binario) ----------------------
+FORMATOS = ("json", "binario")
+
+def guardar_instantanea(objetos: Iterable[Any], ruta_archivo: str, clase: Type[T], formato: str = "json") -> None:
+    """
+    Guarda una instantánea en el formato elegido.
+    
+    Args:
+        objetos: Objetos (de una misma clase dataclass) a guardar
+        ruta_archivo: Ruta del archivo destino
+        clase: Clase de los objetos (la usa el formato binario)
+        formato: "json" (legible) o "binario" (columnar, compacto, con suma de verificación)
+    """
+    if formato == "json":
+        guardar_a_json(objetos, ruta_archivo)
+    elif formato == "binario":
+        with escritura_atomica(ruta_archivo, 'wb') as archivo:
+            archivo.write(binario.codificar(objetos, clase))
+    else:
+        raise ValueError(f"formato no soportado: {formato!r}")
+
+def cargar_instantanea(ruta_archivo: str, clase: Type[T]) -> List[T]:
+    """
+    Carga una instantánea detectando el formato por su cabecera.
+    Una instantánea binaria dañada lanza ValueError en lugar de devolver una lista vacía.
+    """
+    try:
+        with open(ruta_archivo, 'rb') as archivo:
+            cabecera = archivo.read(len(binario.MAGIA))
+            if cabecera == binario.MAGIA:
+                return binario.decodificar(cabecera + archivo.read(), clase)
+    except FileNotFoundError:
         return []
+    return cargar_desde_json(ruta_archivo, clase, _constructor_con_fechas(clase))
+
+def _constructor_con_fechas(clase: Type[T]) -> Optional[Callable[[Dict[str, Any]], T]]:
+    """Constructor que convierte de vuelta a date los campos date (u Optional[date]); None si la clase no tiene."""
+    tipos = get_type_hints(clase)
+    campos_fecha = [f.name for f in fields(clase) if tipos.get(f.name) in (date, Optional[date])]
+    if not campos_fecha:
+        return None
+    def construir(item: Dict[str, Any]) -> T:
+        for nombre in campos_fecha:
+            if item.get(nombre) is not None:
+                item[nombre] = date.fromisoformat(item[nombre])
+        return clase(**item)
+    return construir
+
+# ---------------------- Diario de solo-anexado ----------------------
+# Cada mutación se agrega como una línea JSON al diario en lugar de reescribir
+# todo el archivo; la instantánea (el JSON completo) solo se reescribe al compactar.
+
+def anexar_a_diario(ruta_diario: str, op: str, clave: str, objeto: Optional[Any] = None) -> None:
+    """
+    Agrega una operación al diario (JSON Lines).
+    
+    Args:
+        ruta_diario: Ruta del archivo de diario
+        op: "alta" (insertar o reemplazar la clave) o "baja" (eliminarla)
+        clave: Clave del registro afectado
+        objeto: Objeto a guardar (solo para "alta")
+    """
+    anexar_lote_a_diario(ruta_diario, [(op, clave, objeto)])
+
+def anexar_lote_a_diario(ruta_diario: str, operaciones: Iterable[Tuple[str, str, Optional[Any]]]) -> int:
+    """
+    Agrega varias operaciones (op, clave, objeto) con una sola escritura y un solo fsync.
+    
+    Returns:
+        Cantidad de entradas escritas
+    """
+    entradas = []
+    for op, clave, objeto in operaciones:
+        entrada = {"op": op, "clave": clave}
+        if objeto is not None:
+            entrada["datos"] = asdict(objeto)
+        entradas.append(entrada)
+    return anexar_jsonl(entradas, ruta_diario)
+
+def anexar_jsonl(registros: Iterable[Dict[str, Any]], ruta_archivo: str) -> int:
+    """
+    Agrega registros (dicts) a un archivo JSON Lines con una sola escritura y un solo fsync.
+    
+    Returns:
+        Cantidad de registros escritos
+    """
+    lineas = [json.dumps(registro, ensure_ascii=False, default=_valor_json) + "\n" for registro in registros]
+    if not lineas:
+        return 0
+    # Sin esto, el primer registro quedaría pegado a una línea interrumpida en una sola línea inválida
+    _recortar_linea_incompleta(ruta_archivo)
+    with open(ruta_archivo, 'a', encoding='utf-8') as archivo:
+        archivo.write("".join(lineas))
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    return len(lineas)
+
+def compactar_diario(objetos: Iterable[Any], ruta_archivo: str, ruta_diario: str) -> None:
+    """Escribe la instantánea completa y vacía el diario."""
+    guardar_a_json(objetos, ruta_archivo)
+    if os.path.exists(ruta_diario):
+        os.remove(ruta_diario)
+
+def cargar_con_diario(ruta_archivo: str, ruta_diario: str, clase: Type[T], clave_fn: Callable[[T], str],
+                      constructor: Callable[[Dict[str, Any]], T] = None) -> List[T]:
+    """
+    Carga la instantánea JSON y reaplica encima las operaciones del diario.
+    Reaplicar es idempotente: si una compactación se interrumpió entre escribir
+    la instantánea y vaciar el diario, el resultado sigue siendo correcto.
+    
+    Returns:
+        Lista de objetos resultante (sin orden garantizado)
+    """
+    construir = constructor or (lambda item: clase(**item))
+    registros: Dict[str, T] = {clave_fn(obj): obj for obj in iterar_desde_json(ruta_archivo, clase, constructor)}
+    for entrada in leer_diario(ruta_diario):
+        if entrada["op"] == "alta":
+            registros[entrada["clave"]] = construir(entrada["datos"])
+        else:
+            registros.pop(entrada["clave"], None)
+    return list(registros.values())
+
+def leer_diario(ruta_diario: str) -> List[Dict[str, Any]]:
+    """
+    Lee las entradas del diario. Una última línea sin salto de línea final
+    (escritura interrumpida) se descarta y se recorta del archivo, para que lo
+    que se anexe después empiece en una línea nueva.
+    
+    Raises:
+        ValueError: Si una línea completa no es JSON válido (el diario está dañado)
+    """
+    try:
+        with open(ruta_diario, 'r', encoding='utf-8', newline='\n') as archivo:
+            lineas = archivo.readlines()
+    except FileNotFoundError:
+        return []
+    if lineas and not lineas[-1].endswith("\n"):
+        lineas.pop()
+        _recortar_linea_incompleta(ruta_diario)
+    entradas = []
+    for numero, linea in enumerate(lineas, start=1):
+        try:
+            entradas.append(json.loads(linea))
+        except json.JSONDecodeError as error:
+            raise ValueError(f"La línea {numero} de {ruta_diario} no es JSON válido.") from error
+    return entradas
+
+def _recortar_linea_incompleta(ruta_archivo: str, tamano_bloque: int = 1 << 12) -> None:
+    """Si el archivo no termina en salto de línea, lo trunca hasta el final de su última línea completa."""
+    try:
+        archivo = open(ruta_archivo, 'r+b')
+    except FileNotFoundError:
+        return
+    with archivo:
+        fin = archivo.seek(0, os.SEEK_END)
+        if fin == 0:
+            return
+        archivo.seek(fin - 1)
+        if archivo.read(1) == b"\n":
+            return
+        # Buscar hacia atrás, por bloques, el último salto de línea
+        pos = fin
+        while pos > 0:
+            inicio = max(0, pos - tamano_bloque)
+            archivo.seek(inicio)
+            salto = archivo.read(pos - inicio).rfind(b"\n")
+            if salto != -1:
+                archivo.truncate(inicio + salto + 1)
+                break
+            pos = inicio
+        else:
+            archivo.truncate(0)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+
+# ---------------------- Estado completo de un servicio ----------------------
+
+def _valor_json(valor: Any) -> Any:
+    """Serializa los tipos que json no conoce: dataclasses y fechas (ISO 8601)."""
+    if is_dataclass(valor):
+        return asdict(valor)
+    if isinstance(valor, date):
+        return valor.isoformat()
+    raise TypeError(f"{type(valor).__name__} no es serializable a JSON")
+
+def guardar_estado_json(estado: Dict[str, Any], ruta_archivo: str) -> None:
+    """
+    Guarda un documento de estado (dict con listas de dataclasses, dicts y
+    valores simples) en un único archivo JSON, con escritura atómica.
+    
+    Args:
+        estado: Documento a guardar; las dataclasses se convierten con asdict
+            y las fechas se escriben como "AAAA-MM-DD"
+        ruta_archivo: Ruta del archivo destino
+    """
+    with escritura_atomica(ruta_archivo) as archivo:
+        json.dump(estado, archivo, ensure_ascii=False, default=_valor_json)
+
+def cargar_estado_json(ruta_archivo: str) -> Optional[Dict[str, Any]]:
+    """
+    Lee un documento guardado con guardar_estado_json.
+    
+    Returns:
+        El documento, o None si el archivo no existe
+        
+    Raises:
+        ValueError: Si el archivo no es JSON válido
+    """
+    try:
+        with open(ruta_archivo, 'r', encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as error:
+        raise ValueError(f"El archivo {ruta_archivo} no tiene un formato JSON válido.") from error
@@ -0,0 +1,115 @@
+"""
+Fachada asyncio sobre LibraryService y SearchService.
+
+- Las lecturas concurrentes se agrupan: todas las llamadas a obtener_libro (o a
+  buscar_editorial) hechas en la misma vuelta del event loop se resuelven con
+  una sola consulta en lote.
+- Préstamos y devoluciones operan en memoria y se ejecutan en el propio loop
+  (el desborde del historial a disco lo escribe el hilo escritor del Historial).
+- guardar_estado corre en el ejecutor, y LibraryService solo mantiene sus
+  locks mientras copia el estado, no durante la escritura: un préstamo en el
+  loop nunca espera a ese disco.
+- SearchService no es seguro entre hilos, así que todo acceso a él (lecturas
+  en lote, inserciones y sus escrituras _guardar_* a disco) pasa por un
+  ejecutor de un solo hilo: el event loop nunca espera al disco.
+"""
+from __future__ import annotations
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from src.modelos.models import Book, Editorial, Genero
+from src.servicios.library_service import LibraryService
+from src.servicios.search_service import SearchService
+
+T = TypeVar("T")
+
+
+class _LoteDeLecturas:
+    """
+    Junta las claves pedidas durante una vuelta del event loop y las resuelve
+    con una sola llamada a resolver (lista de claves sin repetir -> dict).
+    """
+    def __init__(self, resolver: Callable[[List[str]], Awaitable[Dict[str, Any]]]) -> None:
+        self._resolver = resolver
+        self._pendientes: Dict[str, List[asyncio.Future]] = {}
+        self._tareas: set = set()
+
+    async def obtener(self, clave: str) -> Any:
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        if not self._pendientes:
+            # call_soon corre después de las corrutinas ya listas: las que piden en esta vuelta entran al lote
+            loop.call_soon(self._despachar)
+        self._pendientes.setdefault(clave, []).append(futuro)
+        return await futuro
+
+    def _despachar(self) -> None:
+        pendientes, self._pendientes = self._pendientes, {}
+        tarea = asyncio.ensure_future(self._resolver_lote(pendientes))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _resolver_lote(self, pendientes: Dict[str, List[asyncio.Future]]) -> None:
+        try:
+            resultados = await self._resolver(list(pendientes))
+        except Exception as error:
+            for futuros in pendientes.values():
+                for futuro in futuros:
+                    if not futuro.done():
+                        futuro.set_exception(error)
+            return
+        for clave, futuros in pendientes.items():
+            for futuro in futuros:
+                if not futuro.done():
+                    futuro.set_result(resultados.get(clave))
+
+
+class AsyncLibraryService:
+    """
+    Versión async de las operaciones de kiosco. Conviene usarla con un
+    LibraryService(concurrente=True) si el mismo servicio se comparte con
+    otros hilos.
+    """
+    def __init__(self, biblioteca: Optional[LibraryService] = None, busquedas: Optional[SearchService] = None) -> None:
+        self.biblioteca = biblioteca if biblioteca is not None else LibraryService(concurrente=True)
+        self.busquedas = busquedas if busquedas is not None else SearchService()
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="busquedas")
+        self._libros = _LoteDeLecturas(self._resolver_libros)
+        self._editoriales = _LoteDeLecturas(self._resolver_editoriales)
+
+    async def _en_ejecutor(self, funcion: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._ejecutor, funcion, *args)
+
+    # ---------------------- Libros y préstamos ----------------------
+    async def obtener_libro(self, isbn: str) -> Optional[Book]:
+        return await self._libros.obtener(isbn)
+
+    async def _resolver_libros(self, isbns: List[str]) -> Dict[str, Optional[Book]]:
+        return self.biblioteca.obtener_libros(isbns)
+
+    async def prestar_libro(self, isbn: str, user_id: str, dias: int = 7) -> Optional[str]:
+        return self.biblioteca.prestar_libro(isbn, user_id, dias)
+
+    async def devolver_libro(self, loan_id: str) -> bool:
+        return self.biblioteca.devolver_libro(loan_id)
+
+    async def guardar_estado(self, ruta_archivo: str) -> None:
+        await self._en_ejecutor(self.biblioteca.guardar_estado, ruta_archivo)
+
+    # ---------------------- Editoriales y géneros ----------------------
+    async def buscar_editorial(self, nombre: str) -> Optional[Editorial]:
+        return await self._editoriales.obtener(nombre)
+
+    async def _resolver_editoriales(self, nombres: List[str]) -> Dict[str, Optional[Editorial]]:
+        return await self._en_ejecutor(lambda: {nombre: self.busquedas.buscar_editorial(nombre) for nombre in nombres})
+
+    async def insertar_editorial(self, editorial: Editorial) -> bool:
+        return await self._en_ejecutor(self.busquedas.insertar_editorial, editorial)
+
+    async def insertar_genero(self, genero: Genero) -> bool:
+        return await self._en_ejecutor(self.busquedas.insertar_genero, genero)
+
+    async def cerrar(self) -> None:
+        """Espera a que terminen las escrituras pendientes y libera el ejecutor."""
+        await asyncio.get_running_loop().run_in_executor(None, self._ejecutor.shutdown)
@@ -0,0 +1,134 @@
+"""
+Historial de auditoría acotado.
+
+Las operaciones se guardan como entradas estructuradas (código de operación,
+ids involucrados, marca de tiempo) en un buffer circular de capacidad fija; al
+llenarse, las más antiguas se desalojan y, si hay ruta_desborde, se anexan a un
+archivo JSON Lines por bloques. Cada bloque lo escribe (con su fsync) un hilo
+escritor propio, así registrar() nunca espera al disco; volcar() espera a que
+terminen las escrituras en curso. Un índice por código de operación permite
+pedir las últimas N operaciones de un tipo sin recorrer todo el historial.
+"""
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.estructuras.ds_linear import RingBuffer
+from src.persistencia.persistencia import anexar_jsonl, iterar_desde_json
+
+
+class EntradaHistorial(NamedTuple):
+    op: str  # código de operación: "LOAN", "RETURN", "ADD_BOOK", ...
+    ids: Tuple[str, ...]  # ids principales (loan_id, isbn, user_id)
+    relacionados: Tuple[str, ...] = ()  # ids secundarios (p. ej. reservas de un lote)
+    marca: float = 0.0  # time.time() de la operación
+
+    def __str__(self) -> str:
+        texto = " ".join((self.op,) + self.ids)
+        return f"{texto} -> {' '.join(self.relacionados)}" if self.relacionados else texto
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "ids": list(self.ids), "relacionados": list(self.relacionados), "marca": self.marca}
+
+    @classmethod
+    def desde_dict(cls, datos: Dict[str, Any]) -> "EntradaHistorial":
+        return cls(datos["op"], tuple(datos["ids"]), tuple(datos.get("relacionados", ())), datos.get("marca", 0.0))
+
+
+class Historial:
+    def __init__(self, capacidad: int = 10_000, ruta_desborde: Optional[str] = None,
+                 bloque_desborde: int = 256) -> None:
+        self._buffer = RingBuffer[EntradaHistorial](capacidad)
+        self._por_op: Dict[str, Deque[EntradaHistorial]] = {}  # op -> entradas en memoria, en orden
+        self.ruta_desborde = ruta_desborde
+        self.bloque_desborde = bloque_desborde
+        self._pendientes: List[EntradaHistorial] = []  # desalojadas aún no enviadas al escritor
+        self._escritor: Optional[ThreadPoolExecutor] = None  # un solo hilo: los bloques se escriben en orden
+        self._escrituras: List[Future] = []  # bloques enviados cuyo resultado no se revisó
+
+    def registrar(self, op: str, *ids: str, relacionados: Iterable[str] = ()) -> EntradaHistorial:
+        entrada = EntradaHistorial(op, ids, tuple(relacionados), time.time())
+        self._agregar(entrada)
+        return entrada
+
+    def _agregar(self, entrada: EntradaHistorial) -> None:
+        desalojada = self._buffer.push(entrada)
+        self._por_op.setdefault(entrada.op, deque()).append(entrada)
+        if desalojada is not None:
+            # La desalojada es la más antigua de todas, y por lo tanto también de su tipo
+            de_su_tipo = self._por_op[desalojada.op]
+            de_su_tipo.popleft()
+            if not de_su_tipo:
+                del self._por_op[desalojada.op]
+            if self.ruta_desborde:
+                self._pendientes.append(desalojada)
+                if len(self._pendientes) >= self.bloque_desborde:
+                    self._enviar_pendientes()
+
+    def _enviar_pendientes(self) -> None:
+        """Entrega el bloque de desalojadas al hilo escritor sin esperar la escritura."""
+        if not (self._pendientes and self.ruta_desborde):
+            return
+        if self._escritor is None:
+            self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="historial")
+        # Las terminadas sin error ya no hace falta revisarlas; un error se informa en volcar()
+        self._escrituras = [f for f in self._escrituras if not f.done() or f.exception() is not None]
+        pendientes, self._pendientes = self._pendientes, []
+        self._escrituras.append(self._escritor.submit(self._escribir_bloque, pendientes))
+
+    def _escribir_bloque(self, entradas: List[EntradaHistorial]) -> None:
+        anexar_jsonl((e.a_dict() for e in entradas), self.ruta_desborde)
+
+    def enviar(self) -> List[Future]:
+        """
+        Entrega al escritor las desalojadas pendientes sin esperar. Devuelve las
+        escrituras en curso, para esperarlas (result()) fuera de cualquier lock.
+        """
+        self._enviar_pendientes()
+        escrituras, self._escrituras = self._escrituras, []
+        return escrituras
+
+    def volcar(self) -> None:
+        """Escribe las desalojadas pendientes y espera a que todas las escrituras lleguen a disco."""
+        for escritura in self.enviar():
+            escritura.result()  # propaga el error de escritura, si lo hubo
+
+    def cerrar(self) -> None:
+        """Vuelca lo pendiente y detiene el hilo escritor."""
+        self.volcar()
+        if self._escritor is not None:
+            self._escritor.shutdown()
+            self._escritor = None
+
+    def ultima(self) -> Optional[EntradaHistorial]:
+        return self._buffer.peek() if len(self._buffer) else None
+
+    def ultimos(self, cantidad: int, op: Optional[str] = None) -> List[EntradaHistorial]:
+        """Las últimas cantidad operaciones en memoria (de la más nueva a la más vieja), opcionalmente de un tipo."""
+        if op is None:
+            return self._buffer.latest(cantidad)
+        de_su_tipo = self._por_op.get(op, ())
+        return [de_su_tipo[-1 - i] for i in range(min(cantidad, len(de_su_tipo)))]
+
+    def leer_desborde(self) -> Iterator[EntradaHistorial]:
+        """Recorre las entradas ya desalojadas a disco, de la más vieja a la más nueva."""
+        self.volcar()
+        if not self.ruta_desborde:
+            return iter(())
+        return iterar_desde_json(self.ruta_desborde, EntradaHistorial, constructor=EntradaHistorial.desde_dict)
+
+    def cargar(self, entradas: Iterable[EntradaHistorial]) -> None:
+        """Agrega entradas ya existentes (p. ej. al restaurar el estado), de la más vieja a la más nueva."""
+        for entrada in entradas:
+            self._agregar(entrada)
+
+    def to_list(self) -> List[EntradaHistorial]:
+        """Entradas en memoria, de la más vieja a la más nueva."""
+        return self._buffer.to_list()
+
+    def __iter__(self) -> Iterator[EntradaHistorial]:
+        return iter(self._buffer)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
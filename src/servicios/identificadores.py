@@ -0,0 +1,54 @@
+"""
+Generación de identificadores: contador monótono protegido por un lock y
+formateado en base 36 con un ancho mínimo ("L00001", ..., "L0000Z", "L00010").
+El contador no depende de cuántos objetos hay en memoria, así que archivar o
+eliminar préstamos nunca lleva a repetir un id, y el ancho crece solo cuando
+hace falta en lugar de desbordarse.
+"""
+import threading
+from typing import Iterable
+
+_DIGITOS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class GeneradorIds:
+    def __init__(self, prefijo: str, ancho: int = 5, siguiente: int = 1) -> None:
+        self.prefijo = prefijo
+        self.ancho = ancho
+        self._siguiente = siguiente
+        self._lock = threading.Lock()
+
+    @property
+    def siguiente(self) -> int:
+        """Número que usará el próximo id (lo que hay que persistir)."""
+        return self._siguiente
+
+    def nuevo(self) -> str:
+        with self._lock:
+            numero = self._siguiente
+            self._siguiente += 1
+        return self.formatear(numero)
+
+    def formatear(self, numero: int) -> str:
+        digitos = []
+        while numero:
+            numero, resto = divmod(numero, 36)
+            digitos.append(_DIGITOS[resto])
+        return self.prefijo + "".join(reversed(digitos)).rjust(self.ancho, "0")
+
+    def decodificar(self, identificador: str) -> int:
+        """Número de un id con este prefijo; ValueError si no tiene el formato."""
+        if not identificador.startswith(self.prefijo):
+            raise ValueError(f"id sin prefijo {self.prefijo!r}: {identificador!r}")
+        return int(identificador[len(self.prefijo):], 36)
+
+    def ajustar(self, existentes: Iterable[str]) -> None:
+        """Avanza el contador más allá de los ids dados (p. ej. al cargar datos sin contador guardado)."""
+        with self._lock:
+            for identificador in existentes:
+                try:
+                    numero = self.decodificar(identificador)
+                except ValueError:
+                    continue
+                if numero >= self._siguiente:
+                    self._siguiente = numero + 1
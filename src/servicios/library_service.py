@@ -1,100 +1,267 @@
-
 from __future__ import annotations
-from typing import Dict, Optional, List
+import threading
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterable, Iterator, NamedTuple, Optional, List, Tuple, Union
+from dataclasses import asdict
 from datetime import date, timedelta
 from src.modelos.models import Book, User, Loan
-from src.estructuras.ds_linear import ArrayList, SinglyLinkedList, Stack, Queue
+from src.estructuras.ds_linear import ArrayList, IndexedLinkedList, MinHeap, Queue
+from src.estructuras.tabla_prestamos import FilaPrestamo, LoanTable
+from src.persistencia.persistencia import guardar_estado_json, cargar_estado_json
+from src.servicios.historial import EntradaHistorial, Historial
+from src.servicios.identificadores import GeneradorIds
+from src.servicios.normalizacion import normalizar
+
+# 2: historial como entradas estructuradas, préstamos archivados y contador de loan_id.
+# Los estados de la versión 1 no se leen (ver cargar_estado).
+VERSION_ESTADO = 2
+
+def _prestamo_desde_dict(datos: Dict[str, Any]) -> Loan:
+    """Reconstruye un Loan leído de JSON (las fechas vienen como texto ISO)."""
+    real = datos.get("fecha_devolucion_real")
+    return Loan(
+        loan_id=datos["loan_id"],
+        user_id=datos["user_id"],
+        isbn=datos["isbn"],
+        fecha_prestamo=date.fromisoformat(datos["fecha_prestamo"]),
+        fecha_devolucion_estimada=date.fromisoformat(datos["fecha_devolucion_estimada"]),
+        fecha_devolucion_real=date.fromisoformat(real) if real else None,
+        devuelto=datos.get("devuelto", False),
+    )
+
+class ResultadoPrestamo(NamedTuple):
+    """Resultado de un ítem de prestar_libros."""
+    isbn: str
+    loan_id: Optional[str]  # solo si estado == "prestado"
+    estado: str  # "prestado", "reservado" (sin stock, quedó en cola), "inexistente" o "usuario_inexistente"
+
+class ResultadoDevolucion(NamedTuple):
+    """Resultado de un ítem de devolver_libros."""
+    loan_id: str
+    estado: str  # "devuelto", "ya_devuelto" o "inexistente"
 
 class LibraryService:
     """
     Capa de servicio que maneja las estructuras de datos y reglas de negocio.
     - Libros: ArrayList ordenado por ISBN (permite búsqueda binaria).
-    - Usuarios: Lista Enlazada Simple (inserción/eliminación eficientes en cabecera).
+    - Índices secundarios de libros: multimapa ordenado por año (consultas por
+      rango) y tablas hash por autor y por título normalizados.
+    - Usuarios: Lista Enlazada indexada por user_id (búsqueda y eliminación O(1)).
+    - Préstamos: diccionario por loan_id más índices de préstamos activos
+      (global, por usuario y por ISBN); los devueltos pueden archivarse en
+      una LoanTable columnar con archivar_devueltos().
+    - Vencimientos: montículo de (fecha estimada, loan_id) para consultar los
+      préstamos atrasados sin recorrer todos los préstamos.
     - Reservas por libro: Cola de user_id.
-    - Historial: Pila de operaciones (pila LIFO) para auditoría sencilla.
+    - Historial: buffer circular acotado de entradas estructuradas (código de
+      operación, ids, marca de tiempo); las más antiguas se desalojan a
+      ruta_historial (JSON Lines) si se indica.
+    El estado completo se guarda y restaura con guardar_estado / cargar_estado.
+
+    Con concurrente=True el servicio puede usarse desde varios hilos: el stock
+    y las reservas de cada libro se protegen con un lock por franja de ISBN
+    (franjas locks repartidos por hash), y el catálogo, los usuarios, los
+    préstamos y el historial tienen cada uno su propio lock. Los locks siempre
+    se toman en este orden: catálogo -> franja ISBN -> usuarios -> préstamos ->
+    historial. Así, préstamos y devoluciones de libros distintos no se esperan
+    entre sí. Sin concurrente, los locks son contextos vacíos.
     """
-    def __init__(self) -> None:
+    def __init__(self, concurrente: bool = False, franjas: int = 64,
+                 capacidad_historial: int = 10_000, ruta_historial: Optional[str] = None) -> None:
+        self.concurrente = concurrente
+        self._capacidad_historial = capacidad_historial
+        self._ruta_historial = ruta_historial
+        nuevo_lock = threading.RLock if concurrente else nullcontext
+        self._lock_catalogo: ContextManager = nuevo_lock()
+        self._locks_isbn: List[ContextManager] = [nuevo_lock() for _ in range(franjas if concurrente else 1)]
+        self._lock_usuarios: ContextManager = nuevo_lock()
+        self._lock_prestamos: ContextManager = nuevo_lock()
+        self._lock_historial: ContextManager = nuevo_lock()
+        self._vaciar()
+
+    def _vaciar(self) -> None:
         self.libros = ArrayList[Book](key_fn=lambda b: b.isbn)  # almacenados ordenados
-        self.usuarios = SinglyLinkedList[User]()
-        self.prestamos: Dict[str, Loan] = {}  # loan_id -> Loan
+        self.usuarios = IndexedLinkedList[str, User](key_fn=lambda u: u.user_id)
+        self.prestamos: Dict[str, Loan] = {}  # loan_id -> Loan (activos y devueltos sin archivar)
+        self.prestamos_archivados = LoanTable()  # devueltos, fuera del diccionario
+        self._ids_prestamo = GeneradorIds("L")
+        self._activos: Dict[str, Loan] = {}  # loan_id -> Loan, en orden de alta
+        self._activos_por_usuario: Dict[str, Dict[str, Loan]] = {}  # user_id -> {loan_id: préstamo}
+        self._activos_por_isbn: Dict[str, Dict[str, Loan]] = {}  # isbn -> {loan_id: préstamo}
+        # Las entradas de préstamos ya devueltos se descartan de forma perezosa
+        self._vencimientos = MinHeap[Tuple[date, str]]()
         self.reservas_por_libro: Dict[str, Queue[str]] = {}  # isbn -> cola de user_id
-        self.historial = Stack[str]()
+        self.historial = Historial(self._capacidad_historial, self._ruta_historial)
+        # Índices secundarios, actualizados de forma incremental
+        self._indice_anio = ArrayList[Tuple[int, str, Book]](key_fn=lambda e: e[0])  # (año, isbn, libro)
+        self._indice_autor: Dict[str, Dict[str, Book]] = {}  # autor normalizado -> {isbn: libro}
+        self._indice_titulo: Dict[str, Dict[str, Book]] = {}  # título normalizado -> {isbn: libro}
+
+    # ---------------------- Sincronización ----------------------
+    def _lock_isbn(self, isbn: str) -> ContextManager:
+        return self._locks_isbn[hash(isbn) % len(self._locks_isbn)]
+
+    @contextmanager
+    def _bloqueo_total(self) -> Iterator[None]:
+        """Toma todos los locks (en el orden fijo) para operar sobre el estado completo."""
+        with ExitStack() as pila:
+            for lock in [self._lock_catalogo, *self._locks_isbn, self._lock_usuarios,
+                         self._lock_prestamos, self._lock_historial]:
+                pila.enter_context(lock)
+            yield
+
+    def _registrar_historial(self, op: str, *ids: str, relacionados: Iterable[str] = ()) -> None:
+        with self._lock_historial:
+            self.historial.registrar(op, *ids, relacionados=relacionados)
 
     # ---------------------- Libros ----------------------
     def agregar_libro(self, libro: Book) -> None:
-        # Insertamos y mantenemos ordenado por ISBN
-        self.libros.append(libro)
-        self.libros.sort_inplace()
-        self.historial.push(f"ADD_BOOK {libro.isbn}")
+        with self._lock_catalogo:
+            # Inserción ordenada por ISBN (búsqueda binaria), sin reordenar todo el arreglo
+            self.libros.insert_sorted(libro)
+            self._indexar_libro(libro)
+        self._registrar_historial("ADD_BOOK", libro.isbn)
+
+    def agregar_libros(self, libros: Iterable[Book]) -> None:
+        """Registra un lote de libros con una sola ordenación/fusión por lote."""
+        lote = list(libros)
+        with self._lock_catalogo:
+            self._cargar_libros(lote)
+        for libro in lote:
+            self._registrar_historial("ADD_BOOK", libro.isbn)
+
+    def _cargar_libros(self, lote: List[Book]) -> None:
+        """Agrega el lote al arreglo y a los índices (una ordenación por estructura)."""
+        self.libros.extend_sorted(lote)
+        self._indice_anio.extend_sorted((b.anio_publicacion, b.isbn, b) for b in lote)
+        for libro in lote:
+            self._indexar_hash(libro)
 
     def _buscar_indice_libro_por_isbn(self, isbn: str) -> int:
         return self.libros.binary_search_index(isbn)
 
     def obtener_libro(self, isbn: str) -> Optional[Book]:
-        idx = self._buscar_indice_libro_por_isbn(isbn)
-        if idx == -1:
-            return None
-        return self.libros.get(idx)
+        with self._lock_catalogo:
+            idx = self._buscar_indice_libro_por_isbn(isbn)
+            if idx == -1:
+                return None
+            return self.libros.get(idx)
+
+    def obtener_libros(self, isbns: Iterable[str]) -> Dict[str, Optional[Book]]:
+        """Resuelve varios ISBN con un único recorrido ordenado del arreglo."""
+        with self._lock_catalogo:
+            indices = self.libros.search_sorted_many(isbns)
+            return {isbn: (self.libros.get(idx) if idx != -1 else None) for isbn, idx in indices.items()}
 
     def actualizar_libro(self, isbn: str, **kwargs) -> bool:
-        idx = self._buscar_indice_libro_por_isbn(isbn)
-        if idx == -1:
-            return False
-        libro = self.libros.get(idx)
-        for k, v in kwargs.items():
-            if hasattr(libro, k):
-                setattr(libro, k, v)
-        # Si cambia ISBN, reordenamos
-        if "isbn" in kwargs:
-            self.libros.sort_inplace()
-        self.historial.push(f"UPDATE_BOOK {isbn}")
+        with self._lock_catalogo, self._lock_isbn(isbn):
+            idx = self._buscar_indice_libro_por_isbn(isbn)
+            if idx == -1:
+                return False
+            libro = self.libros.get(idx)
+            self._desindexar_libro(libro)
+            for k, v in kwargs.items():
+                if hasattr(libro, k):
+                    setattr(libro, k, v)
+            self._indexar_libro(libro)
+            # Si cambia ISBN, lo reubicamos en su nueva posición ordenada
+            if "isbn" in kwargs:
+                self.libros.remove_at(idx)
+                self.libros.insert_sorted(libro)
+        self._registrar_historial("UPDATE_BOOK", isbn)
         return True
 
     def eliminar_libro(self, isbn: str) -> bool:
-        idx = self._buscar_indice_libro_por_isbn(isbn)
-        if idx == -1:
-            return False
-        self.libros.remove_at(idx)
-        self.reservas_por_libro.pop(isbn, None)
-        self.historial.push(f"DELETE_BOOK {isbn}")
+        with self._lock_catalogo, self._lock_isbn(isbn):
+            idx = self._buscar_indice_libro_por_isbn(isbn)
+            if idx == -1:
+                return False
+            self._desindexar_libro(self.libros.remove_at(idx))
+            self.reservas_por_libro.pop(isbn, None)
+        self._registrar_historial("DELETE_BOOK", isbn)
         return True
 
     def listar_libros(self) -> List[Book]:
-        return self.libros.to_list()
+        with self._lock_catalogo:
+            return self.libros.to_list()
+
+    def buscar_por_autor(self, autor: str) -> List[Book]:
+        with self._lock_catalogo:
+            return list(self._indice_autor.get(normalizar(autor), {}).values())
+
+    def buscar_por_titulo(self, titulo: str) -> List[Book]:
+        with self._lock_catalogo:
+            return list(self._indice_titulo.get(normalizar(titulo), {}).values())
+
+    def buscar_por_anio(self, desde: int, hasta: Optional[int] = None) -> List[Book]:
+        """Libros publicados entre desde y hasta (inclusive), ordenados por año."""
+        hasta = desde if hasta is None else hasta
+        with self._lock_catalogo:
+            return [libro for _, _, libro in self._indice_anio.iter_range(desde, hasta)]
+
+    # ---------------------- Índices secundarios ----------------------
+    def _indexar_libro(self, libro: Book) -> None:
+        self._indice_anio.insert_sorted((libro.anio_publicacion, libro.isbn, libro))
+        self._indexar_hash(libro)
+
+    def _indexar_hash(self, libro: Book) -> None:
+        self._indice_autor.setdefault(normalizar(libro.autor), {})[libro.isbn] = libro
+        self._indice_titulo.setdefault(normalizar(libro.titulo), {})[libro.isbn] = libro
+
+    def _desindexar_libro(self, libro: Book) -> None:
+        """Quita el libro de los índices; debe llamarse antes de modificar sus campos."""
+        isbn = libro.isbn
+        self._indice_anio.remove_sorted(libro.anio_publicacion, lambda e: e[1] == isbn)
+        for indice, clave in ((self._indice_autor, normalizar(libro.autor)),
+                              (self._indice_titulo, normalizar(libro.titulo))):
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(isbn, None)
+                if not grupo:
+                    del indice[clave]
 
     # ---------------------- Usuarios ----------------------
     def registrar_usuario(self, user: User) -> None:
-        self.usuarios.push_front(user)
-        self.historial.push(f"ADD_USER {user.user_id}")
+        with self._lock_usuarios:
+            self.usuarios.push_front(user)
+        self._registrar_historial("ADD_USER", user.user_id)
 
     def obtener_usuario(self, user_id: str) -> Optional[User]:
-        return self.usuarios.find_first(lambda u: u.user_id == user_id)
+        with self._lock_usuarios:
+            return self.usuarios.get(user_id)
 
     def eliminar_usuario(self, user_id: str) -> bool:
-        removed = self.usuarios.remove_first(lambda u: u.user_id == user_id)
+        with self._lock_usuarios:
+            removed = self.usuarios.remove(user_id)
         if removed:
-            self.historial.push(f"DELETE_USER {user_id}")
+            self._registrar_historial("DELETE_USER", user_id)
             return True
         return False
 
     def listar_usuarios(self) -> List[User]:
-        return list(self.usuarios)
+        with self._lock_usuarios:
+            return list(self.usuarios)
 
     # ---------------------- Reservas ----------------------
     def _cola_reservas(self, isbn: str) -> Queue[str]:
+        """Cola de reservas del ISBN; se llama con el lock de su franja tomado."""
         if isbn not in self.reservas_por_libro:
-            self.reservas_por_libro[isbn] = Queue[str]()
+            self.reservas_por_libro[isbn] = Queue[str](compact=True)
         return self.reservas_por_libro[isbn]
 
+    def _encolar_reserva(self, libro: Book, user_id: str) -> None:
+        """Agrega la reserva; se llama con el lock de la franja del ISBN tomado."""
+        self._cola_reservas(libro.isbn).enqueue(user_id)
+        libro.tiene_reservas = True
+
     def reservar_libro(self, isbn: str, user_id: str) -> bool:
         libro = self.obtener_libro(isbn)
         usuario = self.obtener_usuario(user_id)
         if not libro or not usuario:
             return False
-        cola = self._cola_reservas(isbn)
-        cola.enqueue(user_id)
-        libro.tiene_reservas = True
-        self.historial.push(f"RESERVE {isbn} by {user_id}")
+        with self._lock_isbn(isbn):
+            self._encolar_reserva(libro, user_id)
+        self._registrar_historial("RESERVE", isbn, user_id)
         return True
 
     # ---------------------- Préstamos ----------------------
@@ -104,64 +271,278 @@ class LibraryService:
         if not libro or not usuario:
             return None
 
-        # Si no hay ejemplares disponibles, encolar reserva automáticamente
-        if libro.ejemplares_disponibles <= 0:
-            self.reservar_libro(isbn, user_id)
-            return None
+        loan_id = self._prestar(libro, user_id, dias)
+        if loan_id is None:
+            self._registrar_historial("RESERVE", isbn, user_id)
+        else:
+            self._registrar_historial("LOAN", loan_id)
+        return loan_id
+
+    def prestar_libros(self, user_id: str, isbns: Iterable[str], dias: int = 7) -> List[ResultadoPrestamo]:
+        """
+        Presta un carrito completo: el usuario se resuelve una vez, los ISBN se
+        buscan con un solo recorrido ordenado del arreglo y se registra una
+        única entrada de historial para el lote.
+        Devuelve, en el orden de isbns, un ResultadoPrestamo por ítem: prestado
+        (con su loan_id), reservado (sin ejemplares: quedó en la cola, como en
+        prestar_libro) o inexistente.
+        """
+        isbns = list(isbns)
+        if not self.obtener_usuario(user_id):
+            return [ResultadoPrestamo(isbn, None, "usuario_inexistente") for isbn in isbns]
+        libros = self.obtener_libros(isbns)
+        resultados: List[ResultadoPrestamo] = []
+        for isbn in isbns:
+            libro = libros[isbn]
+            if libro is None:
+                resultados.append(ResultadoPrestamo(isbn, None, "inexistente"))
+                continue
+            loan_id = self._prestar(libro, user_id, dias)
+            resultados.append(ResultadoPrestamo(isbn, loan_id, "prestado" if loan_id else "reservado"))
+        prestados = [r.loan_id for r in resultados if r.estado == "prestado"]
+        reservados = [r.isbn for r in resultados if r.estado == "reservado"]
+        if prestados or reservados:
+            self._registrar_historial("LOAN_BATCH", user_id, *prestados, relacionados=reservados)
+        return resultados
+
+    def _prestar(self, libro: Book, user_id: str, dias: int) -> Optional[str]:
+        """Descuenta un ejemplar y registra el préstamo, o encola la reserva si no hay stock."""
+        with self._lock_isbn(libro.isbn):
+            # Si no hay ejemplares disponibles, encolar reserva automáticamente
+            if libro.ejemplares_disponibles <= 0:
+                self._encolar_reserva(libro, user_id)
+                return None
 
-        libro.ejemplares_disponibles -= 1
-        loan_id = f"L{len(self.prestamos)+1:05d}"
-        prestamo = Loan(
-            loan_id=loan_id,
-            user_id=user_id,
-            isbn=isbn,
-            fecha_prestamo=date.today(),
-            fecha_devolucion_estimada=date.today() + timedelta(days=dias),
-        )
-        self.prestamos[loan_id] = prestamo
-        self.historial.push(f"LOAN {loan_id}")
+            libro.ejemplares_disponibles -= 1
+            with self._lock_prestamos:
+                loan_id = self._nuevo_loan_id()
+                prestamo = Loan(
+                    loan_id=loan_id,
+                    user_id=user_id,
+                    isbn=libro.isbn,
+                    fecha_prestamo=date.today(),
+                    fecha_devolucion_estimada=date.today() + timedelta(days=dias),
+                )
+                self._registrar_prestamo(prestamo)
         return loan_id
 
     def devolver_libro(self, loan_id: str) -> bool:
-        prestamo = self.prestamos.get(loan_id)
+        with self._lock_prestamos:
+            prestamo = self.prestamos.get(loan_id)
         if not prestamo or prestamo.devuelto:
             return False
-        prestamo.marcar_devuelto()
-
-        libro = self.obtener_libro(prestamo.isbn)
-        if libro:
-            libro.ejemplares_disponibles += 1
-            # Atender la primera reserva si existe
-            cola = self._cola_reservas(libro.isbn)
-            if not cola.is_empty():
-                siguiente_user = cola.dequeue()
-                # Asignar préstamo inmediato al siguiente en la cola (si hay stock)
-                if libro.ejemplares_disponibles > 0:
-                    libro.ejemplares_disponibles -= 1
-                    nuevo_id = f"L{len(self.prestamos)+1:05d}"
-                    nuevo_prestamo = Loan(
-                        loan_id=nuevo_id,
-                        user_id=siguiente_user,
-                        isbn=libro.isbn,
-                        fecha_prestamo=date.today(),
-                        fecha_devolucion_estimada=date.today() + timedelta(days=7),
-                    )
-                    self.prestamos[nuevo_id] = nuevo_prestamo
-                    self.historial.push(f"AUTO_LOAN_FROM_QUEUE {nuevo_id}")
-                # actualizar bandera reservas
-                libro.tiene_reservas = not cola.is_empty()
-            else:
-                libro.tiene_reservas = False
-
-        self.historial.push(f"RETURN {loan_id}")
+        devuelto, nuevo_id = self._devolver(prestamo, self.obtener_libro(prestamo.isbn))
+        if not devuelto:
+            return False
+        if nuevo_id:
+            self._registrar_historial("AUTO_LOAN_FROM_QUEUE", nuevo_id)
+        self._registrar_historial("RETURN", loan_id)
         return True
 
+    def devolver_libros(self, loan_ids: Iterable[str]) -> List[ResultadoDevolucion]:
+        """
+        Devuelve varios préstamos: los préstamos se resuelven con una sola toma
+        del lock de préstamos, los libros con un solo recorrido ordenado y se
+        registra una única entrada de historial para el lote.
+        Devuelve, en el orden de loan_ids, un ResultadoDevolucion por ítem:
+        devuelto, ya_devuelto (también si se repite en el lote) o inexistente.
+        """
+        loan_ids = list(loan_ids)
+        with self._lock_prestamos:
+            prestamos = [self.prestamos.get(loan_id) for loan_id in loan_ids]
+        libros = self.obtener_libros(p.isbn for p in prestamos if p and not p.devuelto)
+        resultados: List[ResultadoDevolucion] = []
+        automaticos: List[str] = []
+        for loan_id, prestamo in zip(loan_ids, prestamos):
+            if prestamo is None:
+                resultados.append(ResultadoDevolucion(loan_id, "inexistente"))
+                continue
+            devuelto = False
+            if not prestamo.devuelto:
+                devuelto, nuevo_id = self._devolver(prestamo, libros[prestamo.isbn])
+                if nuevo_id:
+                    automaticos.append(nuevo_id)
+            resultados.append(ResultadoDevolucion(loan_id, "devuelto" if devuelto else "ya_devuelto"))
+        cerrados = [r.loan_id for r in resultados if r.estado == "devuelto"]
+        if cerrados:
+            self._registrar_historial("RETURN_BATCH", *cerrados, relacionados=automaticos)
+        return resultados
+
+    def _devolver(self, prestamo: Loan, libro: Optional[Book]) -> Tuple[bool, Optional[str]]:
+        """
+        Cierra el préstamo, repone el ejemplar y atiende la primera reserva.
+        Devuelve (si se cerró, loan_id del préstamo automático o None).
+        """
+        nuevo_id = None
+        with self._lock_isbn(prestamo.isbn):
+            with self._lock_prestamos:
+                # Otro hilo pudo devolverlo entre la consulta y la toma de los locks
+                if prestamo.devuelto:
+                    return False, None
+                prestamo.marcar_devuelto()
+                self._cerrar_prestamo(prestamo)
+
+            if libro:
+                libro.ejemplares_disponibles += 1
+                # Atender la primera reserva si existe
+                cola = self._cola_reservas(libro.isbn)
+                if not cola.is_empty():
+                    siguiente_user = cola.dequeue()
+                    # Asignar préstamo inmediato al siguiente en la cola (si hay stock)
+                    if libro.ejemplares_disponibles > 0:
+                        libro.ejemplares_disponibles -= 1
+                        with self._lock_prestamos:
+                            nuevo_id = self._nuevo_loan_id()
+                            nuevo_prestamo = Loan(
+                                loan_id=nuevo_id,
+                                user_id=siguiente_user,
+                                isbn=libro.isbn,
+                                fecha_prestamo=date.today(),
+                                fecha_devolucion_estimada=date.today() + timedelta(days=7),
+                            )
+                            self._registrar_prestamo(nuevo_prestamo)
+                    # actualizar bandera reservas
+                    libro.tiene_reservas = not cola.is_empty()
+                else:
+                    libro.tiene_reservas = False
+        return True, nuevo_id
+
     def listar_prestamos_activos(self) -> List[Loan]:
-        return [p for p in self.prestamos.values() if not p.devuelto]
+        with self._lock_prestamos:
+            return list(self._activos.values())
+
+    def prestamos_activos_de_usuario(self, user_id: str) -> List[Loan]:
+        with self._lock_prestamos:
+            return list(self._activos_por_usuario.get(user_id, {}).values())
+
+    def prestamos_activos_de_libro(self, isbn: str) -> List[Loan]:
+        """Préstamos abiertos del ISBN (uno por ejemplar fuera de la biblioteca)."""
+        with self._lock_prestamos:
+            return list(self._activos_por_isbn.get(isbn, {}).values())
 
-    def obtener_prestamo(self, loan_id: str) -> Optional[Loan]:
-        return self.prestamos.get(loan_id)
+    def obtener_prestamo(self, loan_id: str) -> Optional[Union[Loan, FilaPrestamo]]:
+        """Busca en los préstamos en memoria y, si no está, en el archivo."""
+        with self._lock_prestamos:
+            prestamo = self.prestamos.get(loan_id)
+            if prestamo is None:
+                return self.prestamos_archivados.get(loan_id)
+            return prestamo
+
+    def vencidos(self, hasta: Optional[date] = None) -> List[Loan]:
+        """
+        Préstamos activos cuya fecha estimada de devolución es anterior a hasta
+        (por defecto, hoy), del más atrasado al más reciente. O(k log n) para k
+        resultados; las entradas de préstamos devueltos se saltean y, cuando
+        llegan a la cima, se eliminan.
+        """
+        hasta = date.today() if hasta is None else hasta
+        with self._lock_prestamos:
+            while not self._vencimientos.is_empty() and not self._vencimiento_vigente(self._vencimientos.peek()):
+                self._vencimientos.pop()
+            # (hasta, "") es menor que cualquier entrada con fecha == hasta
+            return [self._activos[entrada[1]] for entrada in self._vencimientos.iter_menores((hasta, ""))
+                    if self._vencimiento_vigente(entrada)]
+
+    def _vencimiento_vigente(self, entrada: Tuple[date, str]) -> bool:
+        fecha, loan_id = entrada
+        prestamo = self._activos.get(loan_id)
+        return prestamo is not None and prestamo.fecha_devolucion_estimada == fecha
+
+    def archivar_devueltos(self) -> int:
+        """Mueve los préstamos devueltos a la tabla de archivo. Devuelve cuántos movió."""
+        with self._lock_prestamos:
+            devueltos = [p for p in self.prestamos.values() if p.devuelto]
+            for prestamo in devueltos:
+                self.prestamos_archivados.agregar(prestamo)
+                del self.prestamos[prestamo.loan_id]
+        return len(devueltos)
+
+    def _nuevo_loan_id(self) -> str:
+        return self._ids_prestamo.nuevo()
+
+    def _registrar_prestamo(self, prestamo: Loan) -> None:
+        self.prestamos[prestamo.loan_id] = prestamo
+        if not prestamo.devuelto:
+            self._activos[prestamo.loan_id] = prestamo
+            self._activos_por_usuario.setdefault(prestamo.user_id, {})[prestamo.loan_id] = prestamo
+            self._activos_por_isbn.setdefault(prestamo.isbn, {})[prestamo.loan_id] = prestamo
+            self._vencimientos.push((prestamo.fecha_devolucion_estimada, prestamo.loan_id))
+
+    def _cerrar_prestamo(self, prestamo: Loan) -> None:
+        """Quita un préstamo devuelto de los índices de activos."""
+        self._activos.pop(prestamo.loan_id, None)
+        for indice, clave in ((self._activos_por_usuario, prestamo.user_id),
+                              (self._activos_por_isbn, prestamo.isbn)):
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(prestamo.loan_id, None)
+                if not grupo:
+                    del indice[clave]
+        # Si las entradas obsoletas superan a las vigentes, reconstruir en O(n)
+        if len(self._vencimientos) > 2 * len(self._activos) + 64:
+            self._vencimientos = MinHeap[Tuple[date, str]](
+                (p.fecha_devolucion_estimada, p.loan_id) for p in self._activos.values())
+
+    # ---------------------- Persistencia ----------------------
+    def guardar_estado(self, ruta_archivo: str) -> None:
+        """
+        Guarda libros, usuarios, préstamos, reservas (en orden de cola) e historial en un JSON.
+        Bajo los locks solo se copia el estado a diccionarios; la escritura y el
+        fsync se hacen después de soltarlos, así préstamos y consultas no esperan al disco.
+        """
+        with self._bloqueo_total():
+            estado = {
+                "version": VERSION_ESTADO,
+                "libros": [asdict(libro) for libro in self.libros],  # ya ordenados por ISBN
+                "usuarios": [asdict(usuario) for usuario in self.usuarios],  # desde la cabecera
+                "prestamos": [asdict(prestamo) for prestamo in self.prestamos.values()],
+                "prestamos_archivados": [asdict(fila.a_loan()) for fila in self.prestamos_archivados.values()],
+                "reservas": {isbn: cola.to_list() for isbn, cola in self.reservas_por_libro.items() if len(cola)},
+                "historial": [entrada.a_dict() for entrada in self.historial],  # de la más vieja a la más nueva
+                "siguiente_loan_id": self._ids_prestamo.siguiente,
+            }
+            escrituras_historial = self.historial.enviar()
+        guardar_estado_json(estado, ruta_archivo)
+        for escritura in escrituras_historial:
+            escritura.result()
+
+    def cargar_estado(self, ruta_archivo: str) -> bool:
+        """
+        Reemplaza el estado actual por el guardado en ruta_archivo.
+        Reconstruye arreglos e índices en bloque (tiempo lineal para datos ya
+        ordenados) en lugar de repetir agregar_libro por cada libro.
+        Devuelve False si el archivo no existe; lanza ValueError si es de otra
+        versión de formato (sin modificar el estado actual).
+        """
+        estado = cargar_estado_json(ruta_archivo)
+        if estado is None:
+            return False
+        if estado.get("version") != VERSION_ESTADO:
+            raise ValueError(f"versión de estado no soportada: {estado.get('version')!r}")
+        with self._bloqueo_total():
+            self.historial.cerrar()
+            self._vaciar()
+            self._cargar_libros([Book(**datos) for datos in estado["libros"]])
+            # push_front invierte el orden: se recorre desde el final
+            for datos in reversed(estado["usuarios"]):
+                self.usuarios.push_front(User(**datos))
+            for datos in estado["prestamos"]:
+                self._registrar_prestamo(_prestamo_desde_dict(datos))
+            for datos in estado["prestamos_archivados"]:
+                self.prestamos_archivados.agregar(_prestamo_desde_dict(datos))
+            self._ids_prestamo = GeneradorIds("L", siguiente=estado["siguiente_loan_id"])
+            for isbn, user_ids in estado["reservas"].items():
+                self._cola_reservas(isbn).enqueue_many(user_ids)
+            self.historial.cargar(EntradaHistorial.desde_dict(datos) for datos in estado["historial"])
+        return True
 
     # ---------------------- Auditoría ----------------------
     def ver_top_historial(self) -> Optional[str]:
-        return self.historial.peek() if len(self.historial) > 0 else None
+        with self._lock_historial:
+            ultima = self.historial.ultima()
+        return str(ultima) if ultima else None
+
+    def ultimas_operaciones(self, cantidad: int, op: Optional[str] = None) -> List[EntradaHistorial]:
+        """Últimas operaciones en memoria (la más reciente primero), opcionalmente solo de un tipo."""
+        with self._lock_historial:
+            return self.historial.ultimos(cantidad, op)
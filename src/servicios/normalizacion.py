@@ -0,0 +1,12 @@
+"""
+Normalización de texto para índices y búsquedas: sin distinguir mayúsculas,
+tildes ni espacios repetidos ("  Poesía  Épica" -> "poesia epica").
+"""
+import unicodedata
+
+
+def normalizar(texto: str) -> str:
+    """Devuelve la forma canónica de texto usada como clave de búsqueda."""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
@@ -1,78 +1,326 @@
-from typing import List, Optional, Dict, Any
+import os
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 from src.modelos.models import Editorial, Genero
-from src.estructuras.arboles import ArbolBinarioBusqueda
-from src.persistencia.persistencia import guardar_a_json, cargar_desde_json
+from src.estructuras.arboles import ArbolBinarioBusqueda, ArbolPrefijos
+from src.persistencia.persistencia import (
+    guardar_a_json, iterar_desde_json, anexar_lote_a_diario, compactar_diario, cargar_con_diario, leer_diario,
+)
+from src.persistencia.indice import IndiceMmap, construir_indice, firma_archivos
+from src.servicios.normalizacion import normalizar
 
 class SearchService:
     """
     Servicio de búsqueda que utiliza árboles binarios de búsqueda para
-    almacenar y buscar editoriales y géneros.
+    almacenar y buscar editoriales y géneros. Junto a cada árbol se mantiene
+    un árbol de prefijos con los nombres normalizados (sin tildes ni
+    mayúsculas) para las sugerencias de autocompletado.
+    
+    Con usar_diario=True cada inserción o actualización se anexa a un diario
+    (JSON Lines) en vez de reescribir el JSON completo; al superar
+    umbral_compactacion entradas se reescribe la instantánea y se vacía el diario.
+    
+    Para un arranque en frío rápido se pueden abrir índices prearmados en disco
+    (abrir_indices): las búsquedas exactas se resuelven sobre el mmap sin
+    construir los árboles, que se materializan recién cuando una operación
+    necesita recorrerlos o modificarlos. Cada índice guarda la firma de la
+    instantánea (y el diario) de la que salió: si no coincide con la actual se
+    descarta, y toda escritura a disco borra el índice de esa colección.
+    Los índices abiertos se liberan con cerrar_indices() o usando el servicio
+    como context manager.
+    
+    Los JSON, diarios e índices se ubican en directorio (por defecto data/).
+    
+    Todas las escrituras son atómicas (archivo temporal + fsync + rename). Dentro
+    de `with svc.agrupar_escrituras():` las escrituras se agrupan y se confirman
+    una sola vez al salir del bloque (group commit).
     """
-    def __init__(self):
-        # Árbol para editoriales, ordenado por nombre
-        self.arbol_editoriales = ArbolBinarioBusqueda[str, Editorial]()
+    def __init__(self, usar_diario: bool = False, umbral_compactacion: int = 1000, directorio: str = "data"):
+        # Árbol para editoriales, ordenado por nombre. Se usa el modo AVL porque
+        # el JSON se guarda ya ordenado y un ABB simple degeneraría en una lista.
+        self.arbol_editoriales = ArbolBinarioBusqueda[str, Editorial](balanceo="avl")
         
         # Árbol para géneros, ordenado por nombre
-        self.arbol_generos = ArbolBinarioBusqueda[str, Genero]()
+        self.arbol_generos = ArbolBinarioBusqueda[str, Genero](balanceo="avl")
+        
+        # Índices de prefijos para autocompletado ("poe" -> "Poesía")
+        self.prefijos_editoriales = ArbolPrefijos[Editorial]()
+        self.prefijos_generos = ArbolPrefijos[Genero]()
+        
+        # Rutas de archivos JSON (todos los archivos del servicio viven en directorio)
+        self.ruta_editoriales = os.path.join(directorio, "editoriales.json")
+        self.ruta_generos = os.path.join(directorio, "generos.json")
+        
+        # Diario de solo-anexado (opcional)
+        self.usar_diario = usar_diario
+        self.umbral_compactacion = umbral_compactacion
+        self.ruta_diario_editoriales = os.path.join(directorio, "editoriales.diario.jsonl")
+        self.ruta_diario_generos = os.path.join(directorio, "generos.diario.jsonl")
+        self._entradas_diario_editoriales = 0
+        self._entradas_diario_generos = 0
         
-        # Rutas de archivos JSON
-        self.ruta_editoriales = "data/editoriales.json"
-        self.ruta_generos = "data/generos.json"
+        # Escrituras pendientes de confirmar (group commit)
+        self._nivel_agrupacion = 0
+        self._reescribir_editoriales = False
+        self._reescribir_generos = False
+        self._diario_pendiente_editoriales: List[Tuple[str, str, Optional[Editorial]]] = []
+        self._diario_pendiente_generos: List[Tuple[str, str, Optional[Genero]]] = []
+        
+        # Índices de solo lectura sobre mmap (opcionales)
+        self.ruta_indice_editoriales = os.path.join(directorio, "editoriales.idx")
+        self.ruta_indice_generos = os.path.join(directorio, "generos.idx")
+        self._indice_editoriales: Optional[IndiceMmap[Editorial]] = None
+        self._indice_generos: Optional[IndiceMmap[Genero]] = None
     
-    def cargar_editoriales(self, editoriales: List[Editorial]) -> None:
-        """Carga una lista de editoriales en el árbol."""
-        for editorial in editoriales:
-            self.arbol_editoriales.insertar(editorial.nombre.lower(), editorial)
+    def construir_indices(self) -> None:
+        """
+        Escribe los índices en disco a partir de la instantánea y el diario en
+        disco (no de los árboles, que pueden no haberse cargado), firmados con
+        su versión actual. Antes confirma las escrituras pendientes.
+        """
+        self.confirmar_escrituras()
+        self._construir_indice_editoriales()
+        self._construir_indice_generos()
     
-    def cargar_generos(self, generos: List[Genero]) -> None:
-        """Carga una lista de géneros en el árbol."""
-        for genero in generos:
-            self.arbol_generos.insertar(genero.nombre.lower(), genero)
+    def _construir_indice_editoriales(self) -> None:
+        # La firma se toma antes de leer: si el archivo cambia mientras tanto, el índice queda desactualizado
+        firma = self._firma_editoriales()
+        construir_indice(((e.nombre.lower(), e) for e in self._leer_editoriales_de_disco()),
+                         self.ruta_indice_editoriales, firma)
+    
+    def _construir_indice_generos(self) -> None:
+        firma = self._firma_generos()
+        construir_indice(((g.nombre.lower(), g) for g in self._leer_generos_de_disco()), self.ruta_indice_generos, firma)
+    
+    def _firma_editoriales(self) -> int:
+        """Firma de los archivos de los que se cargan las editoriales (instantánea y, si se usa, diario)."""
+        if self.usar_diario:
+            return firma_archivos(self.ruta_editoriales, self.ruta_diario_editoriales)
+        return firma_archivos(self.ruta_editoriales)
+    
+    def _firma_generos(self) -> int:
+        """Firma de los archivos de los que se cargan los géneros (instantánea y, si se usa, diario)."""
+        if self.usar_diario:
+            return firma_archivos(self.ruta_generos, self.ruta_diario_generos)
+        return firma_archivos(self.ruta_generos)
+    
+    def abrir_indices(self) -> None:
+        """
+        Arranque en frío: usa los índices en disco en lugar de cargar los árboles.
+        Si un índice falta, está dañado o no corresponde a la instantánea actual,
+        esa colección se carga desde disco y su índice se reconstruye.
+        """
+        self.cerrar_indices()
+        self.arbol_editoriales = ArbolBinarioBusqueda[str, Editorial](balanceo="avl")
+        self.arbol_generos = ArbolBinarioBusqueda[str, Genero](balanceo="avl")
+        self.prefijos_editoriales = ArbolPrefijos[Editorial]()
+        self.prefijos_generos = ArbolPrefijos[Genero]()
+        self._indice_editoriales = _abrir_indice_vigente(self.ruta_indice_editoriales, Editorial,
+                                                         self._firma_editoriales())
+        if self._indice_editoriales is None:
+            self._cargar_editoriales_desde_disco()
+            self._construir_indice_editoriales()
+        self._indice_generos = _abrir_indice_vigente(self.ruta_indice_generos, Genero, self._firma_generos())
+        if self._indice_generos is None:
+            self._cargar_generos_desde_disco()
+            self._construir_indice_generos()
+    
+    def cerrar_indices(self) -> None:
+        """Cierra los índices abiertos (archivo y mmap) sin materializar los árboles."""
+        indice_editoriales, self._indice_editoriales = self._indice_editoriales, None
+        indice_generos, self._indice_generos = self._indice_generos, None
+        for indice in (indice_editoriales, indice_generos):
+            if indice is not None:
+                indice.cerrar()
+    
+    def __enter__(self) -> "SearchService":
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.cerrar_indices()
+    
+    def _materializar_editoriales(self) -> None:
+        """Si hay un índice abierto, construye el árbol a partir de él y lo cierra."""
+        indice, self._indice_editoriales = self._indice_editoriales, None
+        if indice is not None:
+            with indice:
+                self._cargar_arbol_editoriales(indice)
+    
+    def _materializar_generos(self) -> None:
+        """Si hay un índice abierto, construye el árbol a partir de él y lo cierra."""
+        indice, self._indice_generos = self._indice_generos, None
+        if indice is not None:
+            with indice:
+                self._cargar_arbol_generos(indice)
+    
+    def _invalidar_indice(self, ruta_indice: str) -> None:
+        """Borra el índice de una colección cuyos archivos acaban de cambiar."""
+        if os.path.exists(ruta_indice):
+            os.remove(ruta_indice)
+    
+    def cargar_desde_disco(self) -> None:
+        """Carga editoriales y géneros desde los JSON (y sus diarios, si se usan)."""
+        self._cargar_editoriales_desde_disco()
+        self._cargar_generos_desde_disco()
+    
+    def _leer_editoriales_de_disco(self) -> Iterable[Editorial]:
+        """Editoriales de la instantánea, con el diario reaplicado si se usa."""
+        if self.usar_diario:
+            return cargar_con_diario(self.ruta_editoriales, self.ruta_diario_editoriales,
+                                     Editorial, lambda e: e.nombre.lower())
+        return iterar_desde_json(self.ruta_editoriales, Editorial)
+    
+    def _leer_generos_de_disco(self) -> Iterable[Genero]:
+        """Géneros de la instantánea, con el diario reaplicado si se usa."""
+        if self.usar_diario:
+            return cargar_con_diario(self.ruta_generos, self.ruta_diario_generos, Genero, lambda g: g.nombre.lower())
+        return iterar_desde_json(self.ruta_generos, Genero)
+    
+    def _cargar_editoriales_desde_disco(self) -> None:
+        self.cargar_editoriales(self._leer_editoriales_de_disco())
+        if self.usar_diario:
+            self._entradas_diario_editoriales = len(leer_diario(self.ruta_diario_editoriales))
+    
+    def _cargar_generos_desde_disco(self) -> None:
+        self.cargar_generos(self._leer_generos_de_disco())
+        if self.usar_diario:
+            self._entradas_diario_generos = len(leer_diario(self.ruta_diario_generos))
+    
+    def cargar_editoriales(self, editoriales: Iterable[Editorial]) -> None:
+        """Carga editoriales (lista o generador, p. ej. iterar_desde_json) en el árbol.
+        Si el árbol está vacío se construye balanceado en bloque; el JSON guardado
+        ya viene ordenado por nombre, así que la carga es lineal. Un índice
+        abierto se descarta: las editoriales cargadas reemplazan a las suyas.
+        """
+        if self._indice_editoriales is not None:
+            self._indice_editoriales.cerrar()
+            self._indice_editoriales = None
+        self._cargar_arbol_editoriales(editoriales)
+    
+    def _cargar_arbol_editoriales(self, editoriales: Iterable[Editorial]) -> None:
+        pares = [(editorial.nombre.lower(), editorial) for editorial in editoriales]
+        if len(self.arbol_editoriales) == 0:
+            self.arbol_editoriales = ArbolBinarioBusqueda.desde_ordenados(pares, balanceo="avl")
+        else:
+            for clave, editorial in pares:
+                self.arbol_editoriales.insertar(clave, editorial)
+        for _, editorial in pares:
+            self.prefijos_editoriales.insertar(normalizar(editorial.nombre), editorial)
+    
+    def cargar_generos(self, generos: Iterable[Genero]) -> None:
+        """Carga géneros (lista o generador) en el árbol (en bloque si está vacío).
+        Un índice abierto se descarta: los géneros cargados reemplazan a los suyos."""
+        if self._indice_generos is not None:
+            self._indice_generos.cerrar()
+            self._indice_generos = None
+        self._cargar_arbol_generos(generos)
+    
+    def _cargar_arbol_generos(self, generos: Iterable[Genero]) -> None:
+        pares = [(genero.nombre.lower(), genero) for genero in generos]
+        if len(self.arbol_generos) == 0:
+            self.arbol_generos = ArbolBinarioBusqueda.desde_ordenados(pares, balanceo="avl")
+        else:
+            for clave, genero in pares:
+                self.arbol_generos.insertar(clave, genero)
+        for _, genero in pares:
+            self.prefijos_generos.insertar(normalizar(genero.nombre), genero)
     
     def buscar_editorial(self, nombre: str) -> Optional[Editorial]:
         """Busca una editorial por su nombre."""
+        if self._indice_editoriales is not None:
+            return self._indice_editoriales.buscar(nombre.lower())
         return self.arbol_editoriales.buscar(nombre.lower())
     
     def buscar_genero(self, nombre: str) -> Optional[Genero]:
         """Busca un género por su nombre."""
+        if self._indice_generos is not None:
+            return self._indice_generos.buscar(nombre.lower())
         return self.arbol_generos.buscar(nombre.lower())
     
+    def sugerir_editoriales(self, prefijo: str, limite: int = 10) -> List[Editorial]:
+        """Editoriales cuyo nombre empieza por prefijo, sin distinguir tildes ni mayúsculas."""
+        self._materializar_editoriales()
+        return self.prefijos_editoriales.buscar_prefijo(normalizar(prefijo), limite)
+    
+    def sugerir_generos(self, prefijo: str, limite: int = 10) -> List[Genero]:
+        """Géneros cuyo nombre empieza por prefijo, sin distinguir tildes ni mayúsculas."""
+        self._materializar_generos()
+        return self.prefijos_generos.buscar_prefijo(normalizar(prefijo), limite)
+    
     def listar_editoriales(self) -> List[Editorial]:
         """Lista todas las editoriales en orden alfabético."""
+        self._materializar_editoriales()
         return self.arbol_editoriales.recorrer_inorden()
     
     def listar_generos(self) -> List[Genero]:
         """Lista todos los géneros en orden alfabético."""
+        self._materializar_generos()
         return self.arbol_generos.recorrer_inorden()
     
+    def listar_editoriales_pagina(self, pagina: int, tamano_pagina: int = 20) -> List[Editorial]:
+        """Página (base 0) del listado alfabético de editoriales, en O(log n + tamano_pagina)."""
+        self._materializar_editoriales()
+        return list(islice(self.arbol_editoriales.iter_inorden(pagina * tamano_pagina), tamano_pagina))
+    
+    def listar_generos_pagina(self, pagina: int, tamano_pagina: int = 20) -> List[Genero]:
+        """Página (base 0) del listado alfabético de géneros, en O(log n + tamano_pagina)."""
+        self._materializar_generos()
+        return list(islice(self.arbol_generos.iter_inorden(pagina * tamano_pagina), tamano_pagina))
+    
+    def editoriales_en_rango(self, desde: str, hasta: str) -> List[Editorial]:
+        """Editoriales cuyo nombre está entre desde y hasta (inclusive, sin distinguir mayúsculas)."""
+        self._materializar_editoriales()
+        return list(self.arbol_editoriales.rango(desde.lower(), hasta.lower()))
+    
+    def generos_en_rango(self, desde: str, hasta: str) -> List[Genero]:
+        """Géneros cuyo nombre está entre desde y hasta (inclusive, sin distinguir mayúsculas)."""
+        self._materializar_generos()
+        return list(self.arbol_generos.rango(desde.lower(), hasta.lower()))
+    
+    def iterar_editoriales(self) -> Iterator[Editorial]:
+        """Recorre las editoriales en orden alfabético sin construir una lista completa."""
+        self._materializar_editoriales()
+        return self.arbol_editoriales.iter_inorden()
+    
+    def iterar_generos(self) -> Iterator[Genero]:
+        """Recorre los géneros en orden alfabético sin construir una lista completa."""
+        self._materializar_generos()
+        return self.arbol_generos.iter_inorden()
+    
     def insertar_editorial(self, editorial: Editorial) -> bool:
         """Inserta una nueva editorial en el árbol y actualiza el archivo JSON."""
+        self._materializar_editoriales()
         # Verificar si ya existe una editorial con el mismo nombre
         if self.buscar_editorial(editorial.nombre):
             return False  # Ya existe una editorial con ese nombre
         
         # Insertar en el árbol
         self.arbol_editoriales.insertar(editorial.nombre.lower(), editorial)
+        self.prefijos_editoriales.insertar(normalizar(editorial.nombre), editorial)
         
-        # Actualizar el archivo JSON
-        self._guardar_editoriales()
+        # Persistir el cambio (JSON completo o diario)
+        self._persistir_editorial(editorial)
         return True
     
     def insertar_genero(self, genero: Genero) -> bool:
         """Inserta un nuevo género en el árbol y actualiza el archivo JSON."""
+        self._materializar_generos()
         # Verificar si ya existe un género con el mismo nombre
         if self.buscar_genero(genero.nombre):
             return False  # Ya existe un género con ese nombre
         
         # Insertar en el árbol
         self.arbol_generos.insertar(genero.nombre.lower(), genero)
+        self.prefijos_generos.insertar(normalizar(genero.nombre), genero)
         
-        # Actualizar el archivo JSON
-        self._guardar_generos()
+        # Persistir el cambio (JSON completo o diario)
+        self._persistir_genero(genero)
         return True
     
     def actualizar_editorial(self, nombre_original: str, datos_actualizados: Dict[str, Any]) -> bool:
         """Actualiza una editorial existente y el archivo JSON."""
+        self._materializar_editoriales()
         # Buscar la editorial por su nombre
         editorial = self.buscar_editorial(nombre_original)
         if not editorial:
@@ -84,25 +332,25 @@ class SearchService:
                 return False  # Ya existe una editorial con el nuevo nombre
         
         # Actualizar los campos de la editorial
+        prefijo_anterior = normalizar(editorial.nombre)
         for campo, valor in datos_actualizados.items():
             if hasattr(editorial, campo):
                 setattr(editorial, campo, valor)
         
-        # Si cambió el nombre, hay que eliminar y reinsertar con la nueva clave
+        # Si cambió el nombre, se elimina y reinserta solo esa editorial con la nueva clave
         if "nombre" in datos_actualizados and datos_actualizados["nombre"].lower() != nombre_original.lower():
-            # Obtener todas las editoriales excepto la actualizada
-            editoriales = [e for e in self.listar_editoriales() if e.id != editorial.id]
-            # Reinicializar el árbol
-            self.arbol_editoriales = ArbolBinarioBusqueda[str, Editorial]()
-            # Insertar todas las editoriales incluyendo la actualizada
-            self.cargar_editoriales(editoriales + [editorial])
-        
-        # Actualizar el archivo JSON
-        self._guardar_editoriales()
+            self.arbol_editoriales.eliminar(nombre_original.lower())
+            self.arbol_editoriales.insertar(editorial.nombre.lower(), editorial)
+            self.prefijos_editoriales.eliminar(prefijo_anterior, editorial)
+            self.prefijos_editoriales.insertar(normalizar(editorial.nombre), editorial)
+        
+        # Persistir el cambio (JSON completo o diario)
+        self._persistir_editorial(editorial, nombre_original.lower())
         return True
     
     def actualizar_genero(self, nombre_original: str, datos_actualizados: Dict[str, Any]) -> bool:
         """Actualiza un género existente y el archivo JSON."""
+        self._materializar_generos()
         # Buscar el género por su nombre
         genero = self.buscar_genero(nombre_original)
         if not genero:
@@ -114,29 +362,112 @@ class SearchService:
                 return False  # Ya existe un género con el nuevo nombre
         
         # Actualizar los campos del género
+        prefijo_anterior = normalizar(genero.nombre)
         for campo, valor in datos_actualizados.items():
             if hasattr(genero, campo):
                 setattr(genero, campo, valor)
         
-        # Si cambió el nombre, hay que eliminar y reinsertar con la nueva clave
+        # Si cambió el nombre, se elimina y reinserta solo ese género con la nueva clave
         if "nombre" in datos_actualizados and datos_actualizados["nombre"].lower() != nombre_original.lower():
-            # Obtener todos los géneros excepto el actualizado
-            generos = [g for g in self.listar_generos() if g.id != genero.id]
-            # Reinicializar el árbol
-            self.arbol_generos = ArbolBinarioBusqueda[str, Genero]()
-            # Insertar todos los géneros incluyendo el actualizado
-            self.cargar_generos(generos + [genero])
-        
-        # Actualizar el archivo JSON
-        self._guardar_generos()
+            self.arbol_generos.eliminar(nombre_original.lower())
+            self.arbol_generos.insertar(genero.nombre.lower(), genero)
+            self.prefijos_generos.eliminar(prefijo_anterior, genero)
+            self.prefijos_generos.insertar(normalizar(genero.nombre), genero)
+        
+        # Persistir el cambio (JSON completo o diario)
+        self._persistir_genero(genero, nombre_original.lower())
         return True
     
+    @contextmanager
+    def agrupar_escrituras(self) -> Iterator[None]:
+        """Agrupa las escrituras de las operaciones del bloque en una sola confirmación."""
+        self._nivel_agrupacion += 1
+        try:
+            yield
+        finally:
+            self._nivel_agrupacion -= 1
+            if self._nivel_agrupacion == 0:
+                self.confirmar_escrituras()
+    
+    def confirmar_escrituras(self) -> None:
+        """Escribe a disco los cambios pendientes: una reescritura o un lote de diario por colección."""
+        if self._reescribir_editoriales:
+            self._reescribir_editoriales = False
+            self._guardar_editoriales()
+        if self._reescribir_generos:
+            self._reescribir_generos = False
+            self._guardar_generos()
+        if self._diario_pendiente_editoriales:
+            lote, self._diario_pendiente_editoriales = self._diario_pendiente_editoriales, []
+            self._invalidar_indice(self.ruta_indice_editoriales)
+            self._entradas_diario_editoriales += anexar_lote_a_diario(self.ruta_diario_editoriales, lote)
+            if self._entradas_diario_editoriales >= self.umbral_compactacion:
+                self.compactar_editoriales()
+        if self._diario_pendiente_generos:
+            lote, self._diario_pendiente_generos = self._diario_pendiente_generos, []
+            self._invalidar_indice(self.ruta_indice_generos)
+            self._entradas_diario_generos += anexar_lote_a_diario(self.ruta_diario_generos, lote)
+            if self._entradas_diario_generos >= self.umbral_compactacion:
+                self.compactar_generos()
+    
+    def _persistir_editorial(self, editorial: Editorial, clave_anterior: Optional[str] = None) -> None:
+        """Registra el cambio de una editorial: diario (O(1)) o reescritura completa."""
+        if not self.usar_diario:
+            self._reescribir_editoriales = True
+        else:
+            clave = editorial.nombre.lower()
+            if clave_anterior is not None and clave_anterior != clave:
+                self._diario_pendiente_editoriales.append(("baja", clave_anterior, None))
+            self._diario_pendiente_editoriales.append(("alta", clave, editorial))
+        if self._nivel_agrupacion == 0:
+            self.confirmar_escrituras()
+    
+    def _persistir_genero(self, genero: Genero, clave_anterior: Optional[str] = None) -> None:
+        """Registra el cambio de un género: diario (O(1)) o reescritura completa."""
+        if not self.usar_diario:
+            self._reescribir_generos = True
+        else:
+            clave = genero.nombre.lower()
+            if clave_anterior is not None and clave_anterior != clave:
+                self._diario_pendiente_generos.append(("baja", clave_anterior, None))
+            self._diario_pendiente_generos.append(("alta", clave, genero))
+        if self._nivel_agrupacion == 0:
+            self.confirmar_escrituras()
+    
+    def compactar_editoriales(self) -> None:
+        """Reescribe la instantánea de editoriales y vacía su diario."""
+        editoriales = self.iterar_editoriales()  # materializa y cierra el índice antes de borrarlo
+        self._invalidar_indice(self.ruta_indice_editoriales)
+        compactar_diario(editoriales, self.ruta_editoriales, self.ruta_diario_editoriales)
+        self._entradas_diario_editoriales = 0
+    
+    def compactar_generos(self) -> None:
+        """Reescribe la instantánea de géneros y vacía su diario."""
+        generos = self.iterar_generos()  # materializa y cierra el índice antes de borrarlo
+        self._invalidar_indice(self.ruta_indice_generos)
+        compactar_diario(generos, self.ruta_generos, self.ruta_diario_generos)
+        self._entradas_diario_generos = 0
+    
     def _guardar_editoriales(self) -> None:
         """Guarda todas las editoriales en el archivo JSON."""
-        editoriales = self.listar_editoriales()
+        editoriales = self.iterar_editoriales()  # materializa y cierra el índice antes de borrarlo
+        self._invalidar_indice(self.ruta_indice_editoriales)
         guardar_a_json(editoriales, self.ruta_editoriales)
     
     def _guardar_generos(self) -> None:
         """Guarda todos los géneros en el archivo JSON."""
-        generos = self.listar_generos()
+        generos = self.iterar_generos()  # materializa y cierra el índice antes de borrarlo
+        self._invalidar_indice(self.ruta_indice_generos)
         guardar_a_json(generos, self.ruta_generos)
+
+
+def _abrir_indice_vigente(ruta_indice: str, clase: type, firma: int) -> Optional[IndiceMmap]:
+    """Abre el índice si existe, es válido y su firma coincide con la de los archivos de origen; si no, None."""
+    try:
+        indice = IndiceMmap(ruta_indice, clase)
+    except (OSError, ValueError):
+        return None
+    if indice.firma != firma:
+        indice.cerrar()
+        return None
+    return indice
@@ -1,11 +1,12 @@
 import unittest
+import random
 import sys
 import os
 
 # Agregar el directorio raíz al path para poder importar los módulos
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.estructuras.arboles import ArbolBinarioBusqueda
+from src.estructuras.arboles import ArbolBinarioBusqueda, ArbolPrefijos
 
 class TestArbolBinarioBusqueda(unittest.TestCase):
     def setUp(self):
@@ -58,5 +59,142 @@ class TestArbolBinarioBusqueda(unittest.TestCase):
         
         self.assertEqual(valores, claves_esperadas)
 
+    def test_arbol_degenerado_sin_recursion(self):
+        """Un ABB simple con claves ordenadas no debe provocar RecursionError."""
+        n = 5000
+        for i in range(n):
+            self.arbol.insertar(i, i)
+        self.assertEqual(self.arbol.buscar(n - 1), n - 1)
+        self.assertEqual(self.arbol.recorrer_inorden(), list(range(n)))
+
+    def test_iter_inorden_perezoso(self):
+        """iter_inorden entrega los valores bajo demanda."""
+        for clave in ("C", "A", "B"):
+            self.arbol.insertar(clave, f"Valor {clave}")
+        iterador = self.arbol.iter_inorden()
+        self.assertEqual(next(iterador), "Valor A")
+        self.assertEqual(list(iterador), ["Valor B", "Valor C"])
+
+class TestArbolAVL(unittest.TestCase):
+    def setUp(self):
+        self.arbol = ArbolBinarioBusqueda(balanceo="avl")
+
+    def test_claves_ordenadas_no_degeneran(self):
+        """Insertar claves ya ordenadas mantiene la altura logarítmica."""
+        n = 1024
+        for i in range(n):
+            self.arbol.insertar(f"clave{i:05d}", i)
+        # Cota de altura de un AVL: ~1.44 * log2(n)
+        self.assertLessEqual(self.arbol.altura(), 15)
+        self.assertEqual(self.arbol.recorrer_inorden(), list(range(n)))
+        self.assertEqual(self.arbol.buscar("clave00500"), 500)
+        self.assertIsNone(self.arbol.buscar("clave99999"))
+
+    def test_rotacion_doble(self):
+        """Una inserción en zigzag produce una rotación doble."""
+        for clave in ("C", "A", "B"):
+            self.arbol.insertar(clave, f"Valor {clave}")
+        self.assertEqual(self.arbol.raiz.clave, "B")
+        self.assertEqual(self.arbol.raiz.izquierdo.clave, "A")
+        self.assertEqual(self.arbol.raiz.derecho.clave, "C")
+
+    def test_balanceo_invalido(self):
+        with self.assertRaises(ValueError):
+            ArbolBinarioBusqueda(balanceo="rojinegro")
+
+class TestConsultasOrdenadas(unittest.TestCase):
+    def setUp(self):
+        self.arboles = [ArbolBinarioBusqueda(), ArbolBinarioBusqueda(balanceo="avl")]
+        for arbol in self.arboles:
+            for clave in (50, 20, 80, 10, 30, 70, 90, 60):
+                arbol.insertar(clave, clave)
+
+    def test_rango_floor_ceiling(self):
+        for arbol in self.arboles:
+            self.assertEqual(list(arbol.rango(25, 70)), [30, 50, 60, 70])
+            self.assertEqual(list(arbol.rango(91, 99)), [])
+            self.assertEqual(arbol.floor(65), 60)
+            self.assertEqual(arbol.ceiling(65), 70)
+            self.assertIsNone(arbol.floor(5))
+            self.assertIsNone(arbol.ceiling(95))
+            self.assertEqual((arbol.min(), arbol.max()), (10, 90))
+
+    def test_estadisticos_de_orden(self):
+        ordenadas = [10, 20, 30, 50, 60, 70, 80, 90]
+        for arbol in self.arboles:
+            self.assertEqual(len(arbol), 8)
+            self.assertEqual([arbol.k_esimo(i) for i in range(8)], ordenadas)
+            self.assertIsNone(arbol.k_esimo(8))
+            self.assertEqual(arbol.rank(50), 3)
+            self.assertEqual(arbol.rank(55), 4)
+            self.assertEqual(list(arbol.iter_inorden(5)), [70, 80, 90])
+
+class TestEliminacion(unittest.TestCase):
+    def _verificar(self, arbol, esperadas):
+        """Comprueba orden, tamaños y (en AVL) el factor de balanceo de cada nodo."""
+        self.assertEqual(arbol.recorrer_inorden(), sorted(esperadas))
+        pila = [arbol.raiz]
+        while pila:
+            nodo = pila.pop()
+            if nodo is None:
+                continue
+            izq, der = nodo.izquierdo, nodo.derecho
+            self.assertEqual(nodo.tamano, 1 + (izq.tamano if izq else 0) + (der.tamano if der else 0))
+            if arbol.balanceo == "avl":
+                self.assertLessEqual(abs((izq.altura if izq else 0) - (der.altura if der else 0)), 1)
+            pila.extend((izq, der))
+
+    def test_eliminar_casos_y_rebalanceo(self):
+        rnd = random.Random(7)
+        for balanceo in (None, "avl"):
+            arbol = ArbolBinarioBusqueda(balanceo=balanceo)
+            claves = rnd.sample(range(1000), 300)
+            for clave in claves:
+                arbol.insertar(clave, clave)
+            restantes = set(claves)
+            for clave in rnd.sample(claves, 200):
+                self.assertEqual(arbol.eliminar(clave), clave)
+                restantes.discard(clave)
+            self.assertIsNone(arbol.eliminar(5000))
+            self._verificar(arbol, restantes)
+            for clave in list(restantes):
+                arbol.eliminar(clave)
+            self.assertIsNone(arbol.raiz)
+
+class TestConstruccionEnBloque(unittest.TestCase):
+    def test_desde_ordenados_balanceado(self):
+        pares = [(i, f"v{i}") for i in range(1023)]
+        arbol = ArbolBinarioBusqueda.desde_ordenados(pares, balanceo="avl")
+        self.assertEqual(arbol.altura(), 10)  # árbol perfecto de 2^10 - 1 nodos
+        self.assertEqual(len(arbol), 1023)
+        self.assertEqual(arbol.k_esimo(500), "v500")
+        # Sigue siendo un AVL funcional tras la construcción
+        arbol.insertar(2000, "v2000")
+        self.assertEqual(arbol.eliminar(0), "v0")
+        self.assertEqual(arbol.max(), "v2000")
+
+    def test_desde_desordenados(self):
+        arbol = ArbolBinarioBusqueda.desde_ordenados([("C", 3), ("A", 1), ("B", 2)])
+        self.assertEqual(arbol.raiz.clave, "B")
+        self.assertEqual(arbol.recorrer_inorden(), [1, 2, 3])
+        self.assertIsNone(ArbolBinarioBusqueda.desde_ordenados([]).raiz)
+
+class TestArbolPrefijos(unittest.TestCase):
+    def setUp(self):
+        self.trie = ArbolPrefijos()
+        for clave in ("poesia", "poema", "policial", "drama", "poesia epica"):
+            self.trie.insertar(clave, clave.upper())
+
+    def test_busqueda_por_prefijo_ordenada_y_limitada(self):
+        self.assertEqual(self.trie.buscar_prefijo("po"), ["POEMA", "POESIA", "POESIA EPICA", "POLICIAL"])
+        self.assertEqual(self.trie.buscar_prefijo("po", limite=2), ["POEMA", "POESIA"])
+        self.assertEqual(self.trie.buscar_prefijo("x"), [])
+
+    def test_eliminar_poda_ramas(self):
+        self.assertTrue(self.trie.eliminar("policial", "POLICIAL"))
+        self.assertFalse(self.trie.eliminar("policial", "POLICIAL"))
+        self.assertNotIn("l", self.trie.raiz.hijos["p"].hijos["o"].hijos)
+        self.assertEqual(len(self.trie), 4)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Agregar el directorio raíz al path para poder importar los módulos
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.modelos.models import Book, Editorial, User
+from src.servicios import library_service
+from src.servicios.async_service import AsyncLibraryService
+from src.servicios.library_service import LibraryService
+from src.servicios.search_service import SearchService
+
+class TestAsyncLibraryService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        biblioteca = LibraryService(concurrente=True)
+        biblioteca.agregar_libros(Book(f"978-{i}", f"Título {i}", "Ayala", 2020, 1, 1) for i in range(20))
+        biblioteca.registrar_usuario(User("U1", "Ana", "ana@example.com"))
+        busquedas = SearchService(directorio=self.tmp.name)
+        busquedas.cargar_editoriales([Editorial("ED1", "Ática", "Brasil", 1965)])
+        self.svc = AsyncLibraryService(biblioteca, busquedas)
+
+    async def asyncTearDown(self):
+        await self.svc.cerrar()
+
+    async def test_lecturas_concurrentes_en_un_lote(self):
+        lotes = []
+        obtener_libros = self.svc.biblioteca.obtener_libros
+        self.svc.biblioteca.obtener_libros = lambda isbns: (lotes.append(list(isbns)), obtener_libros(isbns))[1]
+        pedidos = [f"978-{i % 25}" for i in range(100)]
+        libros = await asyncio.gather(*(self.svc.obtener_libro(isbn) for isbn in pedidos))
+        self.assertEqual(len(lotes), 1)
+        self.assertEqual(len(lotes[0]), 25)  # claves sin repetir
+        self.assertEqual([b.isbn if b else None for b in libros],
+                         [isbn if int(isbn[4:]) < 20 else None for isbn in pedidos])
+
+    async def test_busquedas_y_escrituras_fuera_del_loop(self):
+        hilos = []
+        guardar = self.svc.busquedas._guardar_editoriales
+        def guardar_registrando():
+            hilos.append(threading.current_thread())
+            guardar()
+        self.svc.busquedas._guardar_editoriales = guardar_registrando
+
+        self.assertTrue(await self.svc.insertar_editorial(Editorial("ED2", "Anagrama", "España", 1969)))
+        self.assertEqual(len(hilos), 1)
+        self.assertIsNot(hilos[0], threading.current_thread())
+        self.assertTrue(os.path.exists(self.svc.busquedas.ruta_editoriales))
+        encontradas = await asyncio.gather(self.svc.buscar_editorial("ática"), self.svc.buscar_editorial("Anagrama"),
+                                           self.svc.buscar_editorial("Ninguna"))
+        self.assertEqual([e.id if e else None for e in encontradas], ["ED1", "ED2", None])
+
+    async def test_prestar_y_devolver(self):
+        loan_id = await self.svc.prestar_libro("978-3", "U1")
+        self.assertIsNotNone(loan_id)
+        self.assertIsNone(await self.svc.prestar_libro("978-3", "U1"))  # sin stock: reserva
+        self.assertTrue(await self.svc.devolver_libro(loan_id))
+        ruta = os.path.join(self.tmp.name, "biblioteca.json")
+        await self.svc.guardar_estado(ruta)
+        self.assertTrue(os.path.exists(ruta))
+
+    async def test_guardar_estado_no_bloquea_prestamos(self):
+        liberar = threading.Event()
+        escribir = library_service.guardar_estado_json
+        def escribir_lento(estado, ruta):
+            liberar.wait(2)  # disco lento: la escritura tarda hasta que el test la libera
+            escribir(estado, ruta)
+        library_service.guardar_estado_json = escribir_lento
+        self.addCleanup(setattr, library_service, "guardar_estado_json", escribir)
+
+        ruta = os.path.join(self.tmp.name, "biblioteca.json")
+        guardado = asyncio.ensure_future(self.svc.guardar_estado(ruta))
+        await asyncio.sleep(0.05)  # el ejecutor ya está escribiendo
+        inicio = time.perf_counter()
+        self.assertIsNotNone(await self.svc.prestar_libro("978-4", "U1"))
+        self.assertLess(time.perf_counter() - inicio, 0.5)
+        self.assertFalse(guardado.done())
+        liberar.set()
+        await guardado
+        self.assertTrue(os.path.exists(ruta))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para poder importar los módulos
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.modelos.models import Editorial, Genero
+from src.persistencia.persistencia import cargar_desde_json
+from src.servicios.search_service import SearchService
+
+class TestSearchService(unittest.TestCase):
+    def setUp(self):
+        # Todos los archivos del servicio (JSON e índices) van a un directorio temporal, no a data/
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.svc = SearchService(directorio=self.tmp.name)
+        with self.svc.agrupar_escrituras():
+            for genero in [Genero("G1", "Poesía", "Verso"), Genero("G2", "Policial", "Crimen"),
+                           Genero("G3", "Drama", "Teatro")]:
+                self.svc.insertar_genero(genero)
+            for editorial in [Editorial("ED1", "Ática", "Brasil", 1965), Editorial("ED2", "Anagrama", "España", 1969)]:
+                self.svc.insertar_editorial(editorial)
+
+    def test_sugerencias_sin_tildes(self):
+        """El autocompletado ignora tildes y mayúsculas."""
+        self.assertEqual([g.id for g in self.svc.sugerir_generos("poesia")], ["G1"])
+        self.assertEqual([g.id for g in self.svc.sugerir_generos("PO")], ["G1", "G2"])
+        self.assertEqual([g.id for g in self.svc.sugerir_generos("po", limite=1)], ["G1"])
+        self.assertEqual([e.id for e in self.svc.sugerir_editoriales("a")], ["ED2", "ED1"])
+
+    def test_paginacion_y_rango(self):
+        self.assertEqual([g.id for g in self.svc.listar_generos_pagina(0, 2)], ["G3", "G1"])
+        self.assertEqual([g.id for g in self.svc.listar_generos_pagina(1, 2)], ["G2"])
+        self.assertEqual([g.id for g in self.svc.generos_en_rango("D", "Pof")], ["G3", "G1"])
+
+    def test_renombrar_reubica_la_clave(self):
+        self.assertTrue(self.svc.actualizar_genero("poesía", {"nombre": "Lírica"}))
+        self.assertIsNone(self.svc.buscar_genero("Poesía"))
+        self.assertEqual(self.svc.buscar_genero("lírica").id, "G1")
+        self.assertEqual([g.id for g in self.svc.listar_generos()], ["G3", "G1", "G2"])
+        self.assertEqual(self.svc.sugerir_generos("poe"), [])
+        self.assertEqual([g.id for g in self.svc.sugerir_generos("lirica")], ["G1"])
+
+    def _servicio_frio(self):
+        frio = SearchService(directorio=self.tmp.name)
+        self.addCleanup(frio.cerrar_indices)
+        return frio
+
+    def _construir_indices(self):
+        self.svc.construir_indices()
+
+    def test_indice_mmap_para_arranque_en_frio(self):
+        self._construir_indices()
+        with self._servicio_frio() as frio:
+            frio.abrir_indices()
+            # Las búsquedas exactas no construyen el árbol
+            self.assertEqual(frio.buscar_genero("POESÍA"), Genero("G1", "Poesía", "Verso"))
+            self.assertEqual(frio.buscar_editorial("ática").id, "ED1")
+            self.assertIsNone(frio.buscar_genero("Ensayo"))
+            self.assertEqual(len(frio.arbol_generos), 0)
+            # Una modificación materializa el árbol desde el índice
+            self.assertTrue(frio.insertar_genero(Genero("G4", "Ensayo", "")))
+            self.assertEqual([g.id for g in frio.listar_generos()], ["G3", "G4", "G1", "G2"])
+
+    def test_indice_desactualizado_se_descarta(self):
+        self._construir_indices()
+        # Otro proceso modifica la instantánea después de armar el índice
+        otro = self._servicio_frio()
+        otro.cargar_desde_disco()
+        self.assertTrue(otro.insertar_editorial(Editorial("ED3", "Sexto Piso", "México", 2002)))
+
+        frio = self._servicio_frio()
+        frio.abrir_indices()
+        self.assertEqual(frio.buscar_editorial("sexto piso").id, "ED3")
+        self.assertTrue(frio.insertar_editorial(Editorial("ED4", "Siruela", "España", 1982)))
+        self.assertEqual(sorted(e.id for e in cargar_desde_json(frio.ruta_editoriales, Editorial)),
+                         ["ED1", "ED2", "ED3", "ED4"])
+        # El índice se reconstruyó al abrir y se borró con la última escritura
+        self.assertFalse(os.path.exists(frio.ruta_indice_editoriales))
+
+    def test_construir_indices_sin_cargar_los_arboles(self):
+        # Un servicio que nunca cargó nada arma los índices desde los archivos, no desde sus árboles vacíos
+        self._servicio_frio().construir_indices()
+        frio = self._servicio_frio()
+        frio.abrir_indices()
+        self.assertEqual(frio.buscar_editorial("anagrama").id, "ED2")
+        self.assertTrue(frio.insertar_editorial(Editorial("ED3", "Sexto Piso", "México", 2002)))
+        self.assertEqual(sorted(e.id for e in cargar_desde_json(frio.ruta_editoriales, Editorial)),
+                         ["ED1", "ED2", "ED3"])
+
+    def test_cargar_descarta_el_indice_abierto(self):
+        self._construir_indices()
+        frio = self._servicio_frio()
+        frio.abrir_indices()
+        indice = frio._indice_editoriales
+        frio.abrir_indices()  # reabrir cierra el anterior
+        self.assertTrue(indice._archivo.closed)
+        frio.cargar_desde_disco()
+        self.assertIsNone(frio._indice_editoriales)
+        self.assertEqual([e.id for e in frio.listar_editoriales()], ["ED2", "ED1"])
+        self.assertEqual([e.id for e in frio.sugerir_editoriales("a")], ["ED2", "ED1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Agregar el directorio raíz al path para poder importar los módulos
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date
+from src.modelos.models import Book, Editorial, Genero, Loan, User
+from src.persistencia.persistencia import (
+    cargar_desde_json, cargar_instantanea, escritura_atomica, guardar_a_json, guardar_instantanea,
+    iterar_desde_json, leer_diario,
+)
+from src.servicios.search_service import SearchService
+
+class TestDiario(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _servicio(self, umbral=100):
+        svc = SearchService(usar_diario=True, umbral_compactacion=umbral, directorio=self.tmp.name)
+        svc.cargar_desde_disco()
+        return svc
+
+    def test_mutaciones_se_anexan_y_se_reaplican(self):
+        svc = self._servicio()
+        svc.insertar_genero(Genero("G1", "Poesía", "Verso"))
+        svc.insertar_genero(Genero("G2", "Drama", "Teatro"))
+        svc.actualizar_genero("Poesía", {"nombre": "Lírica"})
+        # Sin compactar: solo existe el diario (alta, alta, baja + alta)
+        self.assertFalse(os.path.exists(svc.ruta_generos))
+        self.assertEqual([e["op"] for e in leer_diario(svc.ruta_diario_generos)], ["alta", "alta", "baja", "alta"])
+
+        recargado = self._servicio()
+        self.assertEqual([g.nombre for g in recargado.listar_generos()], ["Drama", "Lírica"])
+
+    def test_compactacion_por_umbral(self):
+        svc = self._servicio(umbral=3)
+        for i in range(4):
+            svc.insertar_genero(Genero(f"G{i}", f"Género {i}", ""))
+        # La tercera operación compactó; la cuarta quedó en el diario
+        self.assertEqual(len(leer_diario(svc.ruta_diario_generos)), 1)
+        recargado = self._servicio(umbral=3)
+        self.assertEqual(len(recargado.listar_generos()), 4)
+
+    def test_anexar_despues_de_una_escritura_interrumpida(self):
+        svc = self._servicio()
+        svc.insertar_genero(Genero("G1", "Poesía", "Verso"))
+        with open(svc.ruta_diario_generos, "a", encoding="utf-8") as archivo:
+            archivo.write('{"op": "alta", "clave": "dra')  # corte a mitad de línea
+        svc.insertar_genero(Genero("G3", "Ensayo", ""))
+        svc.insertar_genero(Genero("G4", "Novela", ""))
+        recargado = self._servicio()
+        self.assertEqual(sorted(g.id for g in recargado.listar_generos()), ["G1", "G3", "G4"])
+
+        # Al cargar, la línea incompleta del final se recorta del archivo
+        with open(svc.ruta_diario_generos, "a", encoding="utf-8") as archivo:
+            archivo.write('{"op": "baja"')
+        self.assertEqual(len(leer_diario(svc.ruta_diario_generos)), 3)
+        with open(svc.ruta_diario_generos, "rb") as archivo:
+            self.assertTrue(archivo.read().endswith(b"}\n"))
+
+    def test_linea_danada_en_medio_lanza_error(self):
+        svc = self._servicio()
+        svc.insertar_genero(Genero("G1", "Poesía", "Verso"))
+        with open(svc.ruta_diario_generos, "a", encoding="utf-8") as archivo:
+            archivo.write('{"op": "al\n')
+        svc.insertar_genero(Genero("G2", "Drama", ""))
+        with self.assertRaises(ValueError):
+            leer_diario(svc.ruta_diario_generos)
+
+class TestCargaStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.generos = [Genero(f"G{i}", f"Género {i}", "ñ" * (i % 50)) for i in range(300)]
+
+    def test_arreglo_json_por_bloques(self):
+        ruta = os.path.join(self.tmp.name, "generos.json")
+        guardar_a_json(self.generos, ruta)
+        # Bloques diminutos para forzar objetos partidos entre lecturas
+        self.assertEqual(list(iterar_desde_json(ruta, Genero, tamano_bloque=7)), self.generos)
+
+    def test_json_lines_y_archivos_vacios(self):
+        ruta = os.path.join(self.tmp.name, "generos.jsonl")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write('{"id": "G1", "nombre": "Poesía", "descripcion": ""}\n\n')
+            archivo.write('{"id": "G2", "nombre": "Drama", "descripcion": ""}\n')
+        self.assertEqual([g.id for g in iterar_desde_json(ruta, Genero)], ["G1", "G2"])
+        self.assertEqual(list(iterar_desde_json(os.path.join(self.tmp.name, "no_existe.json"), Genero)), [])
+        vacio = os.path.join(self.tmp.name, "vacio.json")
+        guardar_a_json([], vacio)
+        self.assertEqual(list(iterar_desde_json(vacio, Genero)), [])
+
+class TestInstantaneaBinaria(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_ida_y_vuelta_de_todos_los_modelos(self):
+        hoy = date(2025, 11, 8)
+        casos = {
+            Editorial: [Editorial("ED1", "Ática", "Brasil", 1965), Editorial("ED2", "Anagrama", "España", 1969)],
+            Genero: [Genero("G1", "Poesía", "Verso"), Genero("G2", "Drama", "")],
+            Book: [Book("978-1", "Estructuras", "Ayala", 2020, 3, 2, True), Book("978-2", "Algoritmos", "Ayala", 2020, 1, 1)],
+            User: [User("U1", "Ana", "ana@example.com")],
+            Loan: [Loan("L1", "U1", "978-1", hoy, hoy), Loan("L2", "U1", "978-2", hoy, hoy, hoy, True)],
+        }
+        for clase, objetos in casos.items():
+            ruta = os.path.join(self.tmp.name, f"{clase.__name__}.bin")
+            guardar_instantanea(objetos, ruta, clase, formato="binario")
+            self.assertEqual(cargar_instantanea(ruta, clase), objetos)
+        # El formato JSON sigue disponible (fechas incluidas) y se detecta automáticamente
+        for clase, objetos in casos.items():
+            ruta = os.path.join(self.tmp.name, f"{clase.__name__}.json")
+            guardar_instantanea(objetos, ruta, clase)
+            self.assertEqual(cargar_instantanea(ruta, clase), objetos)
+
+    def test_archivo_danado_se_detecta(self):
+        ruta = os.path.join(self.tmp.name, "generos.bin")
+        guardar_instantanea([Genero("G1", "Poesía", "Verso")], ruta, Genero, formato="binario")
+        with open(ruta, "r+b") as archivo:
+            archivo.seek(-1, os.SEEK_END)
+            archivo.write(b"X")
+        with self.assertRaises(ValueError):
+            cargar_instantanea(ruta, Genero)
+        with self.assertRaises(ValueError):
+            guardar_instantanea([], ruta, Genero, formato="xml")
+
+class TestEscrituraAtomica(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ruta = os.path.join(self.tmp.name, "generos.json")
+
+    def test_error_a_mitad_conserva_el_archivo_anterior(self):
+        guardar_a_json([Genero("G1", "Poesía", "Verso")], self.ruta)
+        with self.assertRaises(RuntimeError):
+            with escritura_atomica(self.ruta) as archivo:
+                archivo.write("[{")
+                raise RuntimeError("corte simulado")
+        self.assertEqual(cargar_desde_json(self.ruta, Genero), [Genero("G1", "Poesía", "Verso")])
+        # No quedan temporales en el directorio
+        self.assertEqual(os.listdir(self.tmp.name), ["generos.json"])
+
+    @unittest.skipIf(os.name == "nt", "permisos POSIX")
+    def test_conserva_los_permisos_del_destino(self):
+        guardar_a_json([Genero("G1", "Poesía", "Verso")], self.ruta)
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(os.stat(self.ruta).st_mode & 0o777, 0o666 & ~umask)
+        os.chmod(self.ruta, 0o640)
+        guardar_a_json([Genero("G2", "Drama", "")], self.ruta)
+        guardar_instantanea([Genero("G2", "Drama", "")], self.ruta, Genero, formato="binario")
+        self.assertEqual(os.stat(self.ruta).st_mode & 0o777, 0o640)
+
+    def test_json_corrupto_lanza_error(self):
+        with open(self.ruta, "w", encoding="utf-8") as archivo:
+            archivo.write('[{"id": "G1", "nombre": "Poe')
+        with self.assertRaises(ValueError):
+            cargar_desde_json(self.ruta, Genero)
+        with self.assertRaises(ValueError):
+            list(iterar_desde_json(self.ruta, Genero))
+
+class TestEscriturasAgrupadas(unittest.TestCase):
+    setUp = TestDiario.setUp
+    _servicio = TestDiario._servicio
+
+    def test_diario_un_lote_por_bloque(self):
+        svc = self._servicio()
+        with svc.agrupar_escrituras():
+            svc.insertar_genero(Genero("G1", "Poesía", "Verso"))
+            svc.insertar_genero(Genero("G2", "Drama", "Teatro"))
+            # Nada se escribe hasta salir del bloque
+            self.assertFalse(os.path.exists(svc.ruta_diario_generos))
+        self.assertEqual(len(leer_diario(svc.ruta_diario_generos)), 2)
+        self.assertEqual(len(self._servicio().listar_generos()), 2)
+
+    def test_modo_completo_reescribe_una_vez(self):
+        svc = SearchService(directorio=self.tmp.name)
+        escrituras = []
+        guardar = svc._guardar_generos
+        svc._guardar_generos = lambda: (escrituras.append(1), guardar())
+        with svc.agrupar_escrituras():
+            for i in range(5):
+                svc.insertar_genero(Genero(f"G{i}", f"Género {i}", ""))
+        self.assertEqual(len(escrituras), 1)
+        self.assertEqual(len(cargar_desde_json(svc.ruta_generos, Genero)), 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,21 @@
 
 import unittest
+import json
 import sys
 import os
+import tempfile
+import threading
 
 # Agregar el directorio raíz al path para poder importar los módulos
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.modelos.models import Book, User
+from datetime import date, timedelta
+from src.modelos.models import Book, Loan, User
+from src.servicios.historial import Historial
+from src.servicios.identificadores import GeneradorIds
 from src.servicios.library_service import LibraryService
+from src.estructuras.ds_linear import MinHeap, Queue, RingBuffer
+from src.estructuras.tabla_prestamos import LoanTable
 
 class TestBibliotecaLineal(unittest.TestCase):
     def setUp(self):
@@ -24,6 +32,41 @@ class TestBibliotecaLineal(unittest.TestCase):
         self.assertEqual(b.titulo, "Estructuras")
         self.assertEqual(b.ejemplares_disponibles, 3)
 
+    def test_insercion_ordenada_por_isbn(self):
+        self.svc.agregar_libro(Book("978-0", "Grafos", "Cormen", 2009, 1, 1))
+        self.svc.agregar_libros([
+            Book("978-4", "Árboles", "Knuth", 1997, 1, 1),
+            Book("978-3", "Hashing", "Sedgewick", 2011, 2, 2),
+        ])
+        isbns = [b.isbn for b in self.svc.listar_libros()]
+        self.assertEqual(isbns, ["978-0", "978-1", "978-2", "978-3", "978-4"])
+        self.assertEqual(self.svc.obtener_libro("978-3").titulo, "Hashing")
+
+    def test_indices_secundarios(self):
+        self.svc.agregar_libros([
+            Book("978-3", "Poesía reunida", "García Márquez", 1985, 1, 1),
+            Book("978-4", "Cien años", "Garcia Marquez", 1967, 2, 2),
+        ])
+        self.assertEqual({b.isbn for b in self.svc.buscar_por_autor("garcía márquez")}, {"978-3", "978-4"})
+        self.assertEqual([b.isbn for b in self.svc.buscar_por_titulo("POESIA REUNIDA")], ["978-3"])
+        self.assertEqual([b.isbn for b in self.svc.buscar_por_anio(1960, 1990)], ["978-4", "978-3"])
+        # Las actualizaciones y eliminaciones mantienen los índices al día
+        self.svc.actualizar_libro("978-4", anio_publicacion=2021, autor="Otro")
+        self.assertEqual([b.isbn for b in self.svc.buscar_por_anio(2021)], ["978-4"])
+        self.assertEqual([b.isbn for b in self.svc.buscar_por_autor("Garcia Marquez")], ["978-3"])
+        self.svc.eliminar_libro("978-3")
+        self.assertEqual(self.svc.buscar_por_autor("Garcia Marquez"), [])
+        self.assertEqual([b.isbn for b in self.svc.buscar_por_anio(2020)], ["978-1", "978-2"])
+
+    def test_registro_indexado_de_usuarios(self):
+        self.svc.registrar_usuario(User("U3", "Eva", "eva@example.com"))
+        self.assertEqual(self.svc.obtener_usuario("U2").nombre, "Luis")
+        self.assertTrue(self.svc.eliminar_usuario("U2"))
+        self.assertIsNone(self.svc.obtener_usuario("U2"))
+        self.assertFalse(self.svc.eliminar_usuario("U2"))
+        # El listado conserva el orden de la lista enlazada (último registrado primero)
+        self.assertEqual([u.user_id for u in self.svc.listar_usuarios()], ["U3", "U1"])
+
     def test_prestar_y_devolver(self):
         loan_id = self.svc.prestar_libro("978-1", "U1", dias=5)
         self.assertIsNotNone(loan_id)
@@ -47,5 +90,271 @@ class TestBibliotecaLineal(unittest.TestCase):
         activos = self.svc.listar_prestamos_activos()
         self.assertTrue(any(p.user_id == "U2" and p.isbn == "978-2" for p in activos))
 
+    def test_indices_de_prestamos_activos_y_archivo(self):
+        l1 = self.svc.prestar_libro("978-1", "U1")
+        l2 = self.svc.prestar_libro("978-1", "U2")
+        l3 = self.svc.prestar_libro("978-2", "U1")
+        self.assertEqual([p.loan_id for p in self.svc.prestamos_activos_de_usuario("U1")], [l1, l3])
+        self.assertEqual(len(self.svc.prestamos_activos_de_libro("978-1")), 2)
+        self.assertTrue(self.svc.devolver_libro(l1))
+        self.assertEqual([p.loan_id for p in self.svc.listar_prestamos_activos()], [l2, l3])
+        self.assertEqual([p.loan_id for p in self.svc.prestamos_activos_de_libro("978-1")], [l2])
+
+        self.assertEqual(self.svc.archivar_devueltos(), 1)
+        self.assertNotIn(l1, self.svc.prestamos)
+        self.assertTrue(self.svc.obtener_prestamo(l1).devuelto)
+        self.assertFalse(self.svc.devolver_libro(l1))
+        # Los ids nuevos no repiten los archivados
+        l4 = self.svc.prestar_libro("978-1", "U1")
+        self.assertNotIn(l4, (l1, l2, l3))
+
+    def test_prestamos_y_devoluciones_en_lote(self):
+        self.svc.agregar_libro(Book("978-0", "Grafos", "Cormen", 2009, 2, 2))
+        carrito = ["978-2", "978-9", "978-0", "978-2"]
+        resultados = self.svc.prestar_libros("U1", carrito)
+        # Un resultado por ítem, en el orden del carrito
+        self.assertEqual([(r.isbn, r.estado) for r in resultados],
+                         [("978-2", "prestado"), ("978-9", "inexistente"), ("978-0", "prestado"), ("978-2", "reservado")])
+        ids = [r.loan_id for r in resultados]
+        self.assertIsNotNone(ids[0])
+        self.assertEqual((ids[1], ids[3]), (None, None))
+        self.assertEqual(self.svc.reservas_por_libro["978-2"].to_list(), ["U1"])
+        lote = self.svc.ultimas_operaciones(1)[0]
+        self.assertEqual((lote.op, lote.ids, lote.relacionados), ("LOAN_BATCH", ("U1", ids[0], ids[2]), ("978-2",)))
+        self.assertEqual({r.estado for r in self.svc.prestar_libros("U9", carrito)}, {"usuario_inexistente"})
+        # Un lote sin préstamos ni reservas no deja entrada en el historial
+        self.assertEqual([r.estado for r in self.svc.prestar_libros("U1", ["978-8", "978-9"])],
+                         ["inexistente", "inexistente"])
+        self.assertIs(self.svc.ultimas_operaciones(1)[0], lote)
+
+        devoluciones = self.svc.devolver_libros([ids[2], "L_NO", ids[0], ids[2]])
+        self.assertEqual([r.estado for r in devoluciones], ["devuelto", "inexistente", "devuelto", "ya_devuelto"])
+        self.assertEqual([r.loan_id for r in devoluciones], [ids[2], "L_NO", ids[0], ids[2]])
+        self.assertEqual(self.svc.obtener_libro("978-0").ejemplares_disponibles, 2)
+        # La devolución de 978-2 atendió la reserva de U1
+        self.assertEqual([p.user_id for p in self.svc.prestamos_activos_de_libro("978-2")], ["U1"])
+        devolucion = self.svc.ultimas_operaciones(1, op="RETURN_BATCH")[0]
+        self.assertEqual(devolucion.ids, (ids[2], ids[0]))
+        self.assertEqual(len(devolucion.relacionados), 1)  # préstamo automático desde la cola
+
+    def test_vencidos_por_fecha(self):
+        hoy = date.today()
+        atrasado = self.svc.prestar_libro("978-1", "U1", dias=-5)
+        devuelto = self.svc.prestar_libro("978-1", "U2", dias=-3)
+        por_vencer = self.svc.prestar_libro("978-2", "U1", dias=2)
+        self.svc.devolver_libro(devuelto)
+        self.assertEqual([p.loan_id for p in self.svc.vencidos()], [atrasado])
+        self.assertEqual([p.loan_id for p in self.svc.vencidos(hasta=hoy + timedelta(days=3))], [atrasado, por_vencer])
+        # Una devolución posterior saca al préstamo de los vencidos
+        self.svc.devolver_libro(atrasado)
+        self.assertEqual(self.svc.vencidos(hasta=hoy + timedelta(days=3)), [self.svc.obtener_prestamo(por_vencer)])
+
+    def test_guardar_y_restaurar_estado(self):
+        self.svc.registrar_usuario(User("U3", "Eva", "eva@example.com"))
+        lid = self.svc.prestar_libro("978-2", "U1")
+        self.svc.prestar_libro("978-2", "U3")  # reservas en orden: U3, U2
+        self.svc.prestar_libro("978-2", "U2")
+        self.svc.devolver_libro(self.svc.prestar_libro("978-1", "U2"))
+        self.svc.archivar_devueltos()
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "biblioteca.json")
+            self.svc.guardar_estado(ruta)
+            restaurado = LibraryService()
+            self.assertTrue(restaurado.cargar_estado(ruta))
+            self.assertFalse(LibraryService().cargar_estado(os.path.join(tmp, "no_existe.json")))
+            # Un estado de la versión 1 (historial como texto) se rechaza sin tocar el servicio
+            anterior = os.path.join(tmp, "v1.json")
+            with open(anterior, "w", encoding="utf-8") as archivo:
+                json.dump({"version": 1, "libros": [], "usuarios": [], "prestamos": [], "reservas": {},
+                           "historial": ["RESERVE 978-1 by U1"]}, archivo)
+            with self.assertRaises(ValueError):
+                restaurado.cargar_estado(anterior)
+
+        self.assertEqual(restaurado.listar_libros(), self.svc.listar_libros())
+        self.assertEqual(restaurado.listar_usuarios(), self.svc.listar_usuarios())
+        self.assertEqual(restaurado.prestamos, self.svc.prestamos)
+        self.assertEqual(len(restaurado.prestamos_archivados), 1)
+        self.assertEqual(restaurado._ids_prestamo.siguiente, self.svc._ids_prestamo.siguiente)
+        self.assertEqual(restaurado.prestamos_activos_de_usuario("U1"), self.svc.prestamos_activos_de_usuario("U1"))
+        self.assertEqual(restaurado.reservas_por_libro["978-2"].to_list(), ["U3", "U2"])
+        self.assertEqual(restaurado.historial.to_list(), self.svc.historial.to_list())
+        self.assertEqual([b.isbn for b in restaurado.buscar_por_anio(2020)], ["978-1", "978-2"])
+        self.assertEqual(len(restaurado.buscar_por_autor("ayala")), 1)
+        # El estado restaurado sigue operando: la devolución atiende la cola
+        self.assertTrue(restaurado.devolver_libro(lid))
+        self.assertTrue(any(p.user_id == "U3" and p.isbn == "978-2" for p in restaurado.listar_prestamos_activos()))
+
+class TestQueue(unittest.TestCase):
+    def test_fifo_y_operaciones_en_lote(self):
+        cola = Queue[str](compact=True)
+        cola.enqueue("U1")
+        cola.enqueue_many(["U2", "U3", "U4"])
+        self.assertEqual(cola.dequeue(), "U1")
+        self.assertEqual(cola.dequeue_many(2), ["U2", "U3"])
+        self.assertEqual(cola.peek(), "U4")
+        self.assertEqual(cola.dequeue_many(10), ["U4"])
+        self.assertTrue(cola.is_empty())
+        with self.assertRaises(IndexError):
+            cola.dequeue()
+
+class TestConcurrencia(unittest.TestCase):
+    def setUp(self):
+        # Cambios de hilo muy frecuentes para provocar intercalados
+        intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, intervalo)
+        self.svc = LibraryService(concurrente=True)
+        self.svc.agregar_libro(Book("978-1", "Popular", "Ayala", 2020, 5, 5))
+        self.svc.agregar_libro(Book("978-2", "Otro", "Ayala", 2021, 50, 50))
+        for i in range(40):
+            self.svc.registrar_usuario(User(f"U{i}", f"Usuario {i}", ""))
+
+    def _en_hilos(self, tareas):
+        barrera = threading.Barrier(len(tareas))
+        resultados = [None] * len(tareas)
+        def correr(i, tarea):
+            barrera.wait()
+            resultados[i] = tarea()
+        hilos = [threading.Thread(target=correr, args=(i, t)) for i, t in enumerate(tareas)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        return resultados
+
+    def test_un_titulo_desde_muchos_hilos(self):
+        ids = self._en_hilos([lambda i=i: self.svc.prestar_libro("978-1", f"U{i}") for i in range(40)])
+        prestados = [loan_id for loan_id in ids if loan_id]
+        # Nunca se prestan más ejemplares de los que hay; el resto queda en reserva
+        self.assertEqual(len(prestados), 5)
+        self.assertEqual(len(set(prestados)), 5)
+        self.assertEqual(self.svc.obtener_libro("978-1").ejemplares_disponibles, 0)
+        self.assertEqual(len(self.svc.reservas_por_libro["978-1"]), 35)
+
+        # Devoluciones concurrentes (cada una dos veces): cada préstamo se cierra una sola vez
+        devueltos = self._en_hilos([lambda l=l: self.svc.devolver_libro(l) for l in prestados * 2])
+        self.assertEqual(sum(devueltos), 5)
+        libro = self.svc.obtener_libro("978-1")
+        activos = self.svc.prestamos_activos_de_libro("978-1")
+        self.assertEqual(len(activos), 5)  # atendidos desde la cola
+        self.assertEqual(libro.ejemplares_disponibles + len(activos), libro.ejemplares_totales)
+        self.assertEqual(len(self.svc.reservas_por_libro["978-1"]), 30)
+
+    def test_ciclos_de_prestamo_y_devolucion(self):
+        def ciclos(i):
+            for _ in range(100):
+                loan_id = self.svc.prestar_libro("978-1", f"U{i}")
+                if loan_id:
+                    self.svc.devolver_libro(loan_id)
+        self._en_hilos([lambda i=i: ciclos(i) for i in range(16)])
+        libro = self.svc.obtener_libro("978-1")
+        self.assertGreaterEqual(libro.ejemplares_disponibles, 0)
+        self.assertEqual(libro.ejemplares_disponibles + len(self.svc.prestamos_activos_de_libro("978-1")),
+                         libro.ejemplares_totales)
+
+    def test_libros_distintos_en_paralelo(self):
+        tareas = [lambda i=i: self.svc.prestar_libro("978-1" if i % 2 else "978-2", f"U{i}") for i in range(40)]
+        ids = self._en_hilos(tareas)
+        self.assertEqual(sum(1 for i, loan_id in enumerate(ids) if loan_id and i % 2), 5)
+        self.assertEqual(sum(1 for i, loan_id in enumerate(ids) if loan_id and not i % 2), 20)
+        self.assertEqual(self.svc.obtener_libro("978-2").ejemplares_disponibles, 30)
+        self.assertEqual(len(self.svc.listar_prestamos_activos()), 25)
+
+class TestHistorial(unittest.TestCase):
+    def test_ring_buffer(self):
+        buffer = RingBuffer[int](3)
+        self.assertEqual([buffer.push(i) for i in range(5)], [None, None, None, 0, 1])
+        self.assertEqual(buffer.to_list(), [2, 3, 4])
+        self.assertEqual(buffer.latest(2), [4, 3])
+        self.assertEqual(buffer.peek(), 4)
+        with self.assertRaises(ValueError):
+            RingBuffer[int](0)
+
+    def test_buffer_acotado_con_desborde_a_disco(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, "historial.jsonl")
+            svc = LibraryService(capacidad_historial=4, ruta_historial=ruta)
+            svc.agregar_libro(Book("978-1", "Estructuras", "Ayala", 2020, 5, 5))
+            svc.registrar_usuario(User("U1", "Ana", "ana@example.com"))
+            ids = [svc.prestar_libro("978-1", "U1") for _ in range(3)]
+            svc.devolver_libro(ids[0])
+
+            self.assertEqual(len(svc.historial), 4)  # nunca supera la capacidad
+            self.assertEqual(svc.ver_top_historial(), f"RETURN {ids[0]}")
+            self.assertEqual([e.ids[0] for e in svc.ultimas_operaciones(10, op="LOAN")], [ids[2], ids[1], ids[0]])
+            self.assertEqual(svc.ultimas_operaciones(10, op="ADD_BOOK"), [])
+            # Las desalojadas quedan en el archivo de desborde, en orden
+            self.assertEqual([(e.op, e.ids) for e in svc.historial.leer_desborde()],
+                             [("ADD_BOOK", ("978-1",)), ("ADD_USER", ("U1",))])
+
+    def test_desborde_lo_escribe_otro_hilo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            historial = Historial(2, os.path.join(tmp, "historial.jsonl"), bloque_desborde=2)
+            hilos = []
+            escribir = historial._escribir_bloque
+            def escribir_registrando(entradas):
+                hilos.append(threading.current_thread())
+                escribir(entradas)
+            historial._escribir_bloque = escribir_registrando
+            for i in range(7):
+                historial.registrar("LOAN", f"L{i}")
+            historial.volcar()
+            self.assertEqual(len(hilos), 3)  # dos bloques completos y el resto al volcar
+            self.assertNotIn(threading.current_thread(), hilos)
+            self.assertEqual([e.ids[0] for e in historial.leer_desborde()], [f"L{i}" for i in range(5)])
+            historial.cerrar()
+
+class TestGeneradorIds(unittest.TestCase):
+    def test_formato_base36_y_ajuste(self):
+        ids = GeneradorIds("L")
+        generados = [ids.nuevo() for _ in range(36)]
+        self.assertEqual(generados[:2], ["L00001", "L00002"])
+        self.assertEqual(generados[9:11], ["L0000A", "L0000B"])
+        self.assertEqual(generados[-1], "L00010")
+        self.assertEqual(len(set(generados)), 36)
+        self.assertEqual(ids.formatear(36 ** 5), "L100000")  # crece en vez de desbordarse
+        self.assertEqual(ids.decodificar("L0000Z"), 35)
+
+        reanudado = GeneradorIds("L")
+        reanudado.ajustar(["L00099", "X123", "L00001"])
+        self.assertEqual(reanudado.decodificar(reanudado.nuevo()), int("99", 36) + 1)
+
+class TestMinHeap(unittest.TestCase):
+    def test_orden_y_recorrido_sin_extraer(self):
+        valores = [7, 3, 9, 1, 4, 8, 2, 6, 5, 0]
+        heap = MinHeap[int](valores)
+        heap.push(10)
+        self.assertEqual(list(heap.iter_menores(5)), [0, 1, 2, 3, 4])
+        self.assertEqual(list(heap.iter_menores(0)), [])
+        self.assertEqual(len(heap), 11)
+        self.assertEqual([heap.pop() for _ in range(len(heap))], list(range(11)))
+        with self.assertRaises(IndexError):
+            heap.peek()
+
+class TestLoanTable(unittest.TestCase):
+    def test_filas_con_interfaz_de_loan(self):
+        tabla = LoanTable()
+        original = Loan("L1", "U1", "978-1", date(2025, 3, 1), date(2025, 3, 8))
+        tabla.agregar(original)
+        tabla.agregar(Loan("L2", "U1", "978-1", date(2025, 3, 2), date(2025, 3, 9), date(2025, 3, 5), True))
+        with self.assertRaises(KeyError):
+            tabla.agregar(original)
+
+        fila = tabla.get("L1")
+        self.assertEqual(fila.a_loan(), original)
+        self.assertEqual((fila.user_id, fila.fecha_devolucion_estimada), ("U1", date(2025, 3, 8)))
+        self.assertIsNone(fila.fecha_devolucion_real)
+        fila.marcar_devuelto()
+        self.assertTrue(tabla.get("L1").devuelto)
+        self.assertEqual(tabla.get("L1").fecha_devolucion_real, date.today())
+        self.assertEqual([f.loan_id for f in tabla.values()], ["L1", "L2"])
+        self.assertIsNone(tabla.get("L3"))
+        self.assertTrue("L2" in tabla and len(tabla) == 2)
+
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass(slots=True) requiere Python 3.10")
+    def test_modelos_sin_dict(self):
+        self.assertFalse(hasattr(Loan("L1", "U1", "978-1", date.today(), date.today()), "__dict__"))
+        self.assertFalse(hasattr(Book("978-1", "T", "A", 2020, 1, 1), "__dict__"))
+
 if __name__ == "__main__":
     unittest.main()